@@ -0,0 +1,245 @@
+"""Stateless HTTP API for the resume tailoring pipeline.
+
+Usage:
+    python api.py --port 8000
+    uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+
+Endpoints (JSON in, JSON out unless noted):
+    POST /parse          raw PDF body -> summary, sections and experience
+    POST /keywords       {"jd"} -> keyword counts
+    POST /summary        {"summary", "jd" or "keywords", "backend"} -> tailored summary
+    POST /experience     {"company", "experience", "jd" or "keywords", "backend"} -> tailored bullets
+    POST /generate-all   {"summary", "experience": {company: text}, "jd" or "keywords", "backend", "batched"}
+    GET  /healthz, GET /metrics (Prometheus text)
+
+No state is kept between requests, so any number of instances can run
+behind a load balancer. PDF parsing runs in a process pool; Groq/Ollama
+calls run on a thread pool so the event loop never blocks on them.
+"""
+import argparse
+import asyncio
+import contextvars
+import functools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app import ResumeProcessor
+from batch import BACKENDS
+from llm_client import LLMError
+from llm_scheduler import current_session
+from metrics import REGISTRY
+
+MAX_PDF_BYTES = int(os.getenv("API_MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+MAX_JSON_BYTES = int(os.getenv("API_MAX_JSON_BYTES", str(1024 * 1024)))
+REQUEST_TIMEOUT = float(os.getenv("API_TIMEOUT", "60"))
+PARSE_WORKERS = int(os.getenv("API_PARSE_WORKERS", "0")) or os.cpu_count() or 1
+LLM_THREADS = int(os.getenv("API_LLM_THREADS", "32"))
+
+# LLMError.kind -> response status; anything else the backend did wrong is a 502
+ERROR_STATUS = {"rate_limited": 429, "saturated": 503, "timeout": 504}
+
+processor = ResumeProcessor()
+_pools = {}
+
+# Per-process state for the PDF parsing pool, set once by _init_worker
+_worker = {}
+
+
+def _init_worker():
+    _worker["processor"] = ResumeProcessor()
+
+
+def _parse_in_worker(data):
+    return _worker["processor"].parse_resume(data)
+
+
+async def _read_body(request, limit):
+    """Read the request body, rejecting it with 413 as soon as it exceeds limit bytes"""
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > limit:
+        raise HTTPException(413, f"Body larger than {limit} bytes")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise HTTPException(413, f"Body larger than {limit} bytes")
+    return bytes(body)
+
+
+async def _read_json(request):
+    body = await _read_body(request, MAX_JSON_BYTES)
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise HTTPException(400, "Body must be a JSON object")
+    if not isinstance(data, dict):
+        raise HTTPException(400, "Body must be a JSON object")
+    # Queue LLM calls fairly per caller, as the UI does per browser session
+    current_session.set(request.headers.get("x-session-id") or (request.client.host if request.client else "default"))
+    return data
+
+
+def _field(data, name, kind=str, default=None):
+    value = data.get(name, default)
+    if value is None or not isinstance(value, kind):
+        raise HTTPException(400, f"'{name}' is required and must be a {kind.__name__}")
+    return value
+
+
+def _keywords(data):
+    """The request's keywords, or those extracted from its "jd" text"""
+    if isinstance(data.get("keywords"), list):
+        return [str(keyword).lower() for keyword in data["keywords"]]
+    return processor.extract_keywords_from_jd(_field(data, "jd"))
+
+
+def _backend(data):
+    backend = data.get("backend", "local")
+    if backend not in BACKENDS:
+        raise HTTPException(400, f"'backend' must be one of {', '.join(sorted(BACKENDS))}")
+    return BACKENDS[backend]
+
+
+async def _run(pool, fn, *args):
+    """Run fn in one of the pools, failing with 504 after REQUEST_TIMEOUT seconds"""
+    loop = asyncio.get_running_loop()
+    if pool == "llm":
+        # Worker threads don't inherit the request context (the scheduler's session) by default
+        fn = functools.partial(contextvars.copy_context().run, fn)
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(_pools[pool], fn, *args), REQUEST_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(504, f"Timed out after {REQUEST_TIMEOUT:g}s")
+
+
+async def _generate(api_choice, fn, *args):
+    # Smart/Local takes well under a millisecond, a thread hop would cost more
+    if api_choice == "Smart/Local":
+        return fn(*args)
+    return await _run("llm", fn, *args)
+
+
+def _describe(error):
+    """JSON body for a failed section: the message and a stable kind"""
+    return {"error": str(error), "kind": getattr(error, "kind", "error")}
+
+
+async def _section_response(key, api_choice, *args):
+    """Generate one section; "degraded" is true when Smart/Local output stood in for a busy backend"""
+    try:
+        content, degraded = await _generate(api_choice, processor.tailor_section, *args)
+    except LLMError as e:
+        return JSONResponse(_describe(e), status_code=ERROR_STATUS.get(e.kind, 502))
+    return JSONResponse({key: content, "degraded": degraded})
+
+
+async def parse(request):
+    data = await _read_body(request, MAX_PDF_BYTES)
+    if not data:
+        raise HTTPException(400, "Send the PDF as the request body")
+    parsed = await _run("parse", _parse_in_worker, data)
+    if not parsed:
+        raise HTTPException(422, "Could not extract text from PDF")
+    return JSONResponse(parsed)
+
+
+async def keywords(request):
+    data = await _read_json(request)
+    return JSONResponse({"keywords": processor.count_keywords_in_jd(_field(data, "jd"))})
+
+
+async def summary(request):
+    data = await _read_json(request)
+    api_choice = _backend(data)
+    return await _section_response("summary", api_choice, "summary", data.get("summary") or "", _keywords(data), api_choice, data.get("use_cache", True))
+
+
+async def experience(request):
+    data = await _read_json(request)
+    api_choice = _backend(data)
+    return await _section_response("experience", api_choice, _field(data, "company"), _field(data, "experience"), _keywords(data), api_choice, data.get("use_cache", True))
+
+
+async def generate_all(request):
+    data = await _read_json(request)
+    api_choice = _backend(data)
+    sections = _field(data, "experience", dict, {})
+    jd_keywords = _keywords(data)
+    generate = lambda: list(processor.generate_all_results(
+        data.get("summary") or "", sections, jd_keywords, api_choice,
+        use_cache=data.get("use_cache", True), batched=bool(data.get("batched", False))))
+    results = await _generate(api_choice, generate)
+
+    response = {"summary": None, "experience": {}, "errors": {}, "degraded": []}
+    for section, content, error, degraded in results:
+        if error is not None:
+            response["errors"][section] = _describe(error)
+            continue
+        if degraded:
+            response["degraded"].append(section)
+        if section == "summary":
+            response["summary"] = content
+        else:
+            response["experience"][section] = content
+    return JSONResponse(response)
+
+
+async def healthz(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def metrics(request):
+    return PlainTextResponse(REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def _http_error(request, exc):
+    return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    _pools["parse"] = ProcessPoolExecutor(max_workers=PARSE_WORKERS, initializer=_init_worker)
+    _pools["llm"] = ThreadPoolExecutor(max_workers=LLM_THREADS, thread_name_prefix="api")
+    try:
+        yield
+    finally:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+app = Starlette(
+    routes=[
+        Route("/parse", parse, methods=["POST"]),
+        Route("/keywords", keywords, methods=["POST"]),
+        Route("/summary", summary, methods=["POST"]),
+        Route("/experience", experience, methods=["POST"]),
+        Route("/generate-all", generate_all, methods=["POST"]),
+        Route("/healthz", healthz),
+        Route("/metrics", metrics),
+    ],
+    exception_handlers={HTTPException: _http_error},
+    lifespan=lifespan,
+)
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the resume tailoring API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Server processes (each with its own parse pool)")
+    args = parser.parse_args(argv)
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
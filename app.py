@@ -1,282 +1,772 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import streamlit as st
-import requests
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import json
-import PyPDF2
-import io
 import re
-import nltk
 import os
-from nltk.corpus import stopwords
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from resume_cache import get_resume_cache
+from llm_client import get_client, raise_for_status, describe_error, LLMResponseError, LLMSaturatedError, LLMTimeoutError, GROQ_API_URL, OLLAMA_API_URL
+from llm_cache import get_response_cache, ResponseCache
+from llm_scheduler import get_scheduler, current_session
+from keywords import DEFAULT_MATCHER, load_stopwords
+from sections import ResumeSectionParser
+from local_engine import get_local_engine
+from pdf_text import PDFPageStream
+from metrics import REGISTRY, start_metrics_server
 
-# Download required NLTK data
-try:
-    nltk.download('stopwords', quiet=True)
-    nltk.download('punkt', quiet=True)
-except:
-    pass
+# PDF backends, nltk, requests and scikit-learn are imported on first use to keep cold start fast
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 class ResumeProcessor:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english')) if 'stopwords' in dir(nltk.corpus) else set()
+    # Bump when parsing logic changes so stale cache entries are not reused
+    PARSE_VERSION = "4"
+    
+    # Sections generation reads; callers that only generate may stop reading the PDF after them
+    GENERATION_SECTIONS = ("summary", "experience")
+
+    # Seconds each section may take in generate_all_content before it is abandoned
+    SECTION_TIMEOUT = float(os.getenv("SECTION_TIMEOUT", "45"))
+    
+    # One context size for every Ollama request; changing it between requests makes Ollama reload the model
+    OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "2048"))
+
+    def __init__(self, keyword_matcher=None, employers=None, local_engine=None):
+        self.keyword_matcher = keyword_matcher or DEFAULT_MATCHER
+        # Optional employer names to detect in addition to the header patterns
+        self.employers = employers
+        self._local_engine = local_engine
+        self._match_scorer = None
+    
+    @property
+    def stop_words(self):
+        """English stopwords, loaded once per process"""
+        return load_stopwords()
+    
+    @property
+    def local_engine(self):
+        """Smart/Local generation engine, loaded once per process unless one was passed in"""
+        return self._local_engine or get_local_engine()
+    
+    @property
+    def match_scorer(self):
+        """Match scorer fitted once on the reference corpus, so JD vectors stay cached across reruns"""
+        if self._match_scorer is None:
+            from scoring import MatchScorer, get_match_scorer, reference_corpus
+            
+            if self.keyword_matcher is DEFAULT_MATCHER:
+                self._match_scorer = get_match_scorer()
+            else:
+                self._match_scorer = MatchScorer(self.keyword_matcher).fit(reference_corpus(self.keyword_matcher))
+        return self._match_scorer
     
     def extract_text_from_pdf(self, pdf_file):
         """Extract text from PDF file"""
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            with REGISTRY.span("pdf_extract"):
+                return "".join(page_text + "\n" for page_text in PDFPageStream(pdf_file))
         except Exception as e:
             st.error(f"Error reading PDF: {e}")
             return ""
     
-    def extract_experience_sections(self, pdf_text):
-        """Extract specific experience sections from resume"""
-        exp_sections = {"ipsos": "", "route": ""}
-        lines = pdf_text.split("\n")
-        current = None
+    def read_resume(self, pdf_bytes, required_sections=None):
+        """Stream PDF pages into the section parser.
+
+        With required_sections, reading stops once those sections are complete
+        and the rest of the document is left unparsed. Returns (text, parsed
+        sections, page stream), or (None, None, None) if the PDF can't be read.
+        """
+        parser = ResumeSectionParser(employers=self.employers)
+        pages = []
+        try:
+            with REGISTRY.span("pdf_extract"):
+                stream = PDFPageStream(pdf_bytes)
+                for page_text in stream:
+                    pages.append(page_text)
+                    for line in page_text.split("\n"):
+                        parser.feed(line)
+                    if required_sections and parser.finished(required_sections):
+                        stream.stop("sections_found")
+                        break
+        except Exception as e:
+            st.error(f"Error reading PDF: {e}")
+            return None, None, None
         
-        for line in lines:
-            line = line.strip()
-            if "Ipsos" in line or "Software Engineer" in line:
-                current = "ipsos"
-                exp_sections[current] += line + "\n"
-            elif "Route Mobile" in line or "Software Developer" in line:
-                current = "route"
-                exp_sections[current] += line + "\n"
-            elif current and line:
-                exp_sections[current] += line + "\n"
-                # Stop if we hit another major section
-                if any(keyword in line.lower() for keyword in ["skills", "education", "project"]):
-                    current = None
+        if stream.truncated:
+            REGISTRY.inc("pdf_truncated_total", reason=stream.truncated)
+        return "\n".join(pages), parser.result(), stream
+    
+    def parse_resume(self, pdf_bytes, required_sections=None):
+        """Parse resume PDF bytes into text, summary, sections and experience (cached by content hash).
+
+        The whole document is read (within the PDF limits) unless
+        required_sections is given, for callers such as batch generation
+        that need nothing after those sections.
+        """
+        misses = []
         
-        return exp_sections
+        def parse(data):
+            misses.append(True)
+            pdf_text, parsed, stream = self.read_resume(data, required_sections)
+            if not pdf_text or not pdf_text.strip():
+                return None
+            return {
+                "text": pdf_text,
+                "summary": parsed["summary"],
+                "sections": parsed["sections"],
+                "experience": {job["company"]: job["text"] for job in parsed["experience"]},
+                "pages_read": stream.pages_read,
+                "page_count": stream.page_count,
+                "truncated": stream.truncated,
+            }
+
+        # Partial parses are cached apart from full ones so neither is served for the other
+        version = self.PARSE_VERSION + (":" + ",".join(required_sections) if required_sections else "")
+        parsed = get_resume_cache().get_or_parse(pdf_bytes, parse, version=version)
+        REGISTRY.inc("resume_cache_total", result="miss" if misses else "hit")
+        return parsed
+    
+    def parse_sections(self, pdf_text):
+        """Segment resume text into summary, sections and employers in a single pass"""
+        with REGISTRY.span("section_parse"):
+            return ResumeSectionParser(employers=self.employers).parse(pdf_text)
+    
+    def extract_experience_sections(self, pdf_text):
+        """Extract experience sections from resume, keyed by company name"""
+        return {job["company"]: job["text"] for job in self.parse_sections(pdf_text)["experience"]}
     
     def extract_current_summary(self, pdf_text):
         """Extract current summary from resume"""
-        lines = pdf_text.split("\n")
-        summary = ""
-        in_summary = False
-        
-        for line in lines:
-            line = line.strip()
-            if any(keyword in line.lower() for keyword in ["summary", "objective", "profile"]):
-                in_summary = True
-                continue
-            elif in_summary and line:
-                if any(keyword in line.lower() for keyword in ["experience", "skills", "education"]):
-                    break
-                summary += line + " "
-        
-        return summary.strip()
+        return self.parse_sections(pdf_text)["summary"]
     
     def extract_keywords_from_jd(self, jd_text):
         """Extract relevant keywords from job description"""
         if not jd_text:
             return []
         
-        # Common tech keywords to look for
-        tech_keywords = [
-            "python", "django", "flask", "fastapi", "api", "rest", "sql", "postgresql", 
-            "mysql", "aws", "docker", "kubernetes", "redis", "celery", "git", "ci/cd",
-            "machine learning", "ml", "ai", "javascript", "react", "microservices",
-            "cloud", "backend", "frontend", "database", "nosql", "mongodb", "java",
-            "spring", "nodejs", "vue", "angular", "kubernetes", "jenkins", "devops"
-        ]
+        with REGISTRY.span("keyword_match"):
+            return self.keyword_matcher.extract(jd_text)
+    
+    def count_keywords_in_jd(self, jd_text):
+        """Count mentions of each relevant keyword in job description"""
+        if not jd_text:
+            return {}
+        
+        with REGISTRY.span("keyword_match"):
+            return self.keyword_matcher.counts(jd_text)
+    
+    def score_match(self, resume_text, jd_text, top_k=8):
+        """Score how well the resume matches a job description and list missing skills"""
+        if not resume_text or not jd_text:
+            return {"score": 0.0, "missing_skills": []}
         
-        jd_lower = jd_text.lower()
-        found_keywords = []
+        with REGISTRY.span("score_match"):
+            scorer = self.match_scorer
+            return {
+                "score": float(scorer.score(resume_text, [jd_text])[0]),
+                "missing_skills": [skill for skill, _ in scorer.missing_skills(resume_text, jd_text, top_k)],
+            }
+    
+    def generate_tailored_summary(self, current_summary, jd_keywords, api_choice="Smart/Local", stream=False, use_cache=True):
+        """Generate tailored summary based on current summary and JD keywords.
+
+        With stream=True the Groq/Ollama paths return a generator of text chunks;
+        use_cache=False bypasses the LLM response cache.
+        """
+        if api_choice == "Smart/Local":
+            with REGISTRY.span("local_generate", section="summary"):
+                return self._local_summary(current_summary, jd_keywords)
         
-        for keyword in tech_keywords:
-            if keyword in jd_lower:
-                found_keywords.append(keyword)
+        prompt = self._summary_prompt(current_summary, jd_keywords, api_choice)
+        fallback = lambda: self._local_summary(current_summary, jd_keywords)
+        if api_choice == "Groq":
+            return self.stream_groq_api(prompt, use_cache, fallback) if stream else self.call_groq_api(prompt, use_cache, fallback)
+        return self.stream_ollama_api(prompt, use_cache, fallback) if stream else self.call_ollama_api(prompt, use_cache, fallback)
+    
+    def generate_tailored_experience(self, experience_text, company_name, jd_keywords, api_choice="Smart/Local", stream=False, use_cache=True):
+        """Generate tailored experience description.
+
+        With stream=True the Groq/Ollama paths return a generator of text chunks;
+        use_cache=False bypasses the LLM response cache.
+        """
+        if api_choice == "Smart/Local":
+            with REGISTRY.span("local_generate", section="experience"):
+                return self._local_experience(experience_text, company_name, jd_keywords)
         
-        return found_keywords
+        prompt = self._experience_prompt(experience_text, company_name, jd_keywords, api_choice)
+        fallback = lambda: self._local_experience(experience_text, company_name, jd_keywords)
+        if api_choice == "Groq":
+            return self.stream_groq_api(prompt, use_cache, fallback) if stream else self.call_groq_api(prompt, use_cache, fallback)
+        return self.stream_ollama_api(prompt, use_cache, fallback) if stream else self.call_ollama_api(prompt, use_cache, fallback)
     
-    def generate_tailored_summary(self, current_summary, jd_keywords, api_choice="Smart/Local"):
-        """Generate tailored summary based on current summary and JD keywords"""
+    def tailor_section(self, section, section_text, jd_keywords, api_choice="Smart/Local", use_cache=True, fallback=True, queue_timeout=None):
+        """Generate one section ("summary" or a company name) without turning failures into text.
+
+        Returns (content, degraded), where degraded means Groq/Ollama was busy
+        and Smart/Local output was used instead. Other Groq/Ollama failures
+        are raised as LLMError. Callers with no user waiting (batch runs) can
+        pass fallback=False to get LLMSaturatedError instead of Smart/Local
+        output, and a longer queue_timeout than the scheduler's default.
+        """
+        if section == "summary":
+            local = lambda: self._local_summary(section_text, jd_keywords)
+        else:
+            local = lambda: self._local_experience(section_text, section, jd_keywords)
+        
         if api_choice == "Smart/Local":
-            # Enhanced local generation
-            base = "Innovative Software Developer with 2.5+ years of experience in creating secure and scalable applications. Developed backend services using Python, Django, and Flask, improving system performance and user engagement."
-            
-            # Customize based on JD keywords
-            if jd_keywords:
-                if any(kw in jd_keywords for kw in ["aws", "cloud"]):
-                    base += " Experienced with AWS cloud services and containerization technologies."
-                if any(kw in jd_keywords for kw in ["api", "rest"]):
-                    base += " Specialized in RESTful API development and microservices architecture."
-                if any(kw in jd_keywords for kw in ["machine learning", "ml", "ai"]):
-                    base += " Interested in applying AI/ML technologies to solve complex problems."
-                if any(kw in jd_keywords for kw in ["java", "spring"]):
-                    base += " Adaptable to Java and Spring framework development."
-                if any(kw in jd_keywords for kw in ["devops", "ci/cd"]):
-                    base += " Experienced with DevOps practices and CI/CD pipeline implementation."
-            
-            base += " Seeking a Software Developer role to enhance software solutions through expertise in Python, RESTful API development, and cloud integration."
-            return base
+            with REGISTRY.span("local_generate", section="summary" if section == "summary" else "experience"):
+                return local(), False
         
-        elif api_choice == "Groq":
-            prompt = f"""Rewrite this professional summary to match the job requirements. Keep it 3-4 sentences and ATS-friendly:
+        if section == "summary":
+            prompt = self._summary_prompt(section_text, jd_keywords, api_choice)
+        else:
+            prompt = self._experience_prompt(section_text, section, jd_keywords, api_choice)
+        return self._generate("groq" if api_choice == "Groq" else "ollama", prompt, use_cache, local if fallback else None, queue_timeout)
+    
+    def _summary_prompt(self, current_summary, jd_keywords, api_choice):
+        """Summary prompt; Ollama's small model gets a shorter one"""
+        if api_choice == "Groq":
+            return f"""Rewrite this professional summary to match the job requirements. Keep it 3-4 sentences and ATS-friendly:
 
 Current Summary: {current_summary}
 
 Job Keywords: {', '.join(jd_keywords)}
 
 Focus on: Python, Django, Flask, and relevant skills from the job keywords."""
-            
-            return self.call_groq_api(prompt)
-        
-        else:  # Ollama
-            prompt = f"Rewrite professional summary for Software Developer. Include these keywords: {', '.join(jd_keywords[:5])}. Current: {current_summary[:200]}"
-            return self.call_ollama_api(prompt)
+        return f"Rewrite professional summary for Software Developer. Include these keywords: {', '.join(jd_keywords[:5])}. Current: {current_summary[:200]}"
     
-    def generate_tailored_experience(self, experience_text, company_name, jd_keywords, api_choice="Smart/Local"):
-        """Generate tailored experience description"""
-        if api_choice == "Smart/Local":
-            if "ipsos" in company_name.lower():
-                base_points = [
-                    "Developed backend services using Python with Django and Flask for unified data platform",
-                    "Designed and implemented scalable features for data ingestion and ETL pipelines",
-                    "Built RESTful APIs using Flask and Django REST Framework for data management",
-                    "Enhanced resource efficiency by designing distributed task workflows with Celery",
-                    "Reduced manual configuration by 40% through automated end-to-end workflows"
-                ]
-                
-                # Customize based on JD keywords
-                if jd_keywords:
-                    if "aws" in jd_keywords:
-                        base_points.insert(2, "Deployed applications on AWS using containerization and cloud services")
-                    if "microservices" in jd_keywords:
-                        base_points.insert(1, "Architected microservices-based solutions for improved scalability")
-                    if "java" in jd_keywords:
-                        base_points.insert(3, "Collaborated on Java-based integrations and cross-platform development")
-                
-                return "\n".join(f"• {point}" for point in base_points[:5])
-            
-            elif "route" in company_name.lower():
-                base_points = [
-                    "Implemented secure authentication mechanisms using JWT tokens and OAuth",
-                    "Analyzed and optimized source code improving performance by 25%",
-                    "Integrated PostgreSQL and MySQL databases using SQLAlchemy",
-                    "Automated deployment pipelines using CI/CD tools like Jenkins and GitLab",
-                    "Managed datasets with over 1 million records and reduced deployment time by 30%"
-                ]
-                
-                # Customize based on JD keywords
-                if jd_keywords:
-                    if "docker" in jd_keywords:
-                        base_points.insert(3, "Containerized applications using Docker for consistent deployment")
-                    if "api" in jd_keywords:
-                        base_points.insert(1, "Developed and maintained RESTful APIs serving millions of requests")
-                    if "devops" in jd_keywords:
-                        base_points.insert(4, "Implemented DevOps best practices for continuous integration and deployment")
-                
-                return "\n".join(f"• {point}" for point in base_points[:5])
-        
-        elif api_choice == "Groq":
-            prompt = f"""Rewrite this work experience with 4-5 bullet points. Make it ATS-friendly and highlight skills relevant to the job:
+    def _experience_prompt(self, experience_text, company_name, jd_keywords, api_choice):
+        """Experience prompt; Ollama's small model gets a shorter one"""
+        if api_choice == "Groq":
+            return f"""Rewrite this work experience with 4-5 bullet points. Make it ATS-friendly and highlight skills relevant to the job:
 
 Company: {company_name}
 Experience: {experience_text}
 Job Keywords: {', '.join(jd_keywords)}
 
 Focus on technical achievements and quantifiable results."""
+        return f"Rewrite {company_name} experience in 4 bullet points. Include: {', '.join(jd_keywords[:3])}. Text: {experience_text[:300]}"
+    
+    def _local_summary(self, current_summary, jd_keywords):
+        """Smart/Local summary from the taxonomy's summary templates"""
+        return self.local_engine.summary(jd_keywords)
+    
+    def _local_experience(self, experience_text, company_name, jd_keywords):
+        """Smart/Local experience bullets ranked by JD keyword overlap"""
+        return self.local_engine.experience(company_name, experience_text, jd_keywords)
+    
+    def generate_all_content(self, current_summary, experience_sections, jd_keywords, api_choice="Smart/Local", timeout=None, use_cache=True, batched=False):
+        """Generate every section like generate_all_results, yielding (section, text) for display.
+
+        Failures are yielded as "❌ ..." messages and Smart/Local fallbacks
+        carry a "⚠️ ... busy" banner.
+        """
+        label = "Groq API" if api_choice == "Groq" else api_choice
+        for section, content, error, degraded in self.generate_all_results(current_summary, experience_sections, jd_keywords, api_choice, timeout, use_cache, batched):
+            if error is not None:
+                yield section, describe_error(label, error)
+            elif degraded:
+                yield section, self._busy_text(label, content)
+            else:
+                yield section, content
+    
+    def generate_all_results(self, current_summary, experience_sections, jd_keywords, api_choice="Smart/Local", timeout=None, use_cache=True, batched=False,
+                             fallback=True, queue_timeout=None):
+        """Generate the summary and every experience section concurrently.
+
+        experience_sections maps company name to experience text. Yields
+        (section, content, error, degraded) as each section finishes, where
+        section is "summary" or a company name. A failed section has content
+        None and the exception (an LLMError for backend failures) as error;
+        degraded is as in tailor_section. Sections still running after
+        timeout seconds are cancelled and fail with LLMTimeoutError. With
+        batched=True, Groq/Ollama first get one request for all sections and
+        only sections missing from its answer are generated separately. The
+        timeout covers both: the batched request is abandoned after half of
+        it so the per-section requests still get the rest. fallback and queue_timeout are passed to
+        tailor_section.
+        """
+        timeout = self.SECTION_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        tasks = {"summary": current_summary}
+        for company, experience_text in experience_sections.items():
+            if experience_text:
+                tasks[company] = experience_text
+        
+        # Local generation is instant, a thread pool would only add overhead
+        if api_choice == "Smart/Local":
+            for key, section_text in tasks.items():
+                content, degraded = self.tailor_section(key, section_text, jd_keywords, api_choice)
+                yield key, content, None, degraded
+            return
+        
+        # One spare worker so an abandoned batched request doesn't hold up the per-section fallback
+        executor = ThreadPoolExecutor(max_workers=len(tasks) + int(batched), thread_name_prefix="generate")
+        try:
+            if batched:
+                companies = [company for company in tasks if company != "summary"]
+                # Each task runs in a copy of the caller's context so the scheduler sees the caller's session
+                future = executor.submit(contextvars.copy_context().run, self.generate_all_batched, current_summary,
+                                         {company: experience_sections[company] for company in companies}, jd_keywords, api_choice, use_cache, queue_timeout)
+                try:
+                    generated = future.result(timeout=timeout / 2)
+                except FutureTimeoutError:
+                    REGISTRY.inc("llm_batched_total", backend="groq" if api_choice == "Groq" else "ollama", result="timeout")
+                    generated = {}
+                for key, content in generated.items():
+                    yield key, content, None, False
+                tasks = {key: task for key, task in tasks.items() if key not in generated}
+                if not tasks:
+                    return
             
-            return self.call_groq_api(prompt)
+            futures = {
+                executor.submit(contextvars.copy_context().run, self.tailor_section, key, section_text, jd_keywords, api_choice, use_cache, fallback, queue_timeout): key
+                for key, section_text in tasks.items()
+            }
+            yield from self._collect_sections(futures, api_choice, timeout, max(deadline - time.monotonic(), 0.0))
+        finally:
+            # Don't block on abandoned requests, they finish on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _collect_sections(self, futures, api_choice, timeout, remaining):
+        """Yield generate_all_results tuples as section futures finish, failing those still running after remaining seconds"""
+        try:
+            for future in as_completed(futures, timeout=remaining):
+                try:
+                    content, degraded = future.result()
+                    yield futures[future], content, None, degraded
+                except Exception as e:
+                    yield futures[future], None, e, False
+        except FutureTimeoutError:
+            backend = "groq" if api_choice == "Groq" else "ollama"
+            for future, key in futures.items():
+                if not future.done():
+                    future.cancel()
+                    yield key, None, LLMTimeoutError(f"no answer within {timeout:g}s", backend=backend), False
+    
+    def generate_all_batched(self, current_summary, experience_sections, jd_keywords, api_choice="Groq", use_cache=True, queue_timeout=None):
+        """Generate the summary and all experience sections with one JSON-mode Groq/Ollama request.
+
+        Returns {section: content} for the sections the model answered; the
+        dict is empty if the request failed or its JSON could not be parsed.
+        """
+        backend = "groq" if api_choice == "Groq" else "ollama"
+        sections = len(experience_sections) + 1
+        prompt = self._batched_prompt(current_summary, experience_sections, jd_keywords, backend)
+        try:
+            with REGISTRY.span("llm_batched", backend=backend):
+                if backend == "groq":
+                    headers, payload = self._groq_request(prompt, max_tokens=300 * sections, json_mode=True)
+                    content = self._complete("groq", payload, headers, use_cache, queue_timeout)
+                else:
+                    payload = self._ollama_payload(prompt, num_predict=200 * sections, json_mode=True)
+                    content = self._complete("ollama", payload, use_cache=use_cache, queue_timeout=queue_timeout)
+        except Exception as e:
+            REGISTRY.inc("llm_errors_total", backend=backend, kind=getattr(e, "kind", type(e).__name__))
+            REGISTRY.inc("llm_batched_total", backend=backend, result="failed")
+            return {}
         
-        else:  # Ollama
-            prompt = f"Rewrite {company_name} experience in 4 bullet points. Include: {', '.join(jd_keywords[:3])}. Text: {experience_text[:300]}"
-            return self.call_ollama_api(prompt)
+        generated = self._parse_batched(content, list(experience_sections))
+        if not generated:
+            result = "unparsable"
+        elif len(generated) < sections:
+            result = "partial"
+        else:
+            result = "ok"
+        REGISTRY.inc("llm_batched_total", backend=backend, result=result)
+        return generated
+    
+    def _batched_prompt(self, current_summary, experience_sections, jd_keywords, backend):
+        """Build one prompt asking for the summary and every experience section as JSON"""
+        # Ollama's small context window gets the same trimmed inputs as the per-section prompts
+        summary_limit, experience_limit = (None, None) if backend == "groq" else (200, 300)
+        parts = [
+            "Rewrite this resume to match the job requirements. Make everything ATS-friendly.",
+            f"Job Keywords: {', '.join(jd_keywords)}",
+            f"Current Summary: {current_summary[:summary_limit]}",
+        ]
+        for company, experience_text in experience_sections.items():
+            parts.append(f"Experience at {company}: {experience_text[:experience_limit]}")
+        example = {
+            "summary": "3-4 sentence professional summary",
+            "experience": {company: ["4-5 bullet points with technical achievements and quantifiable results"] for company in experience_sections},
+        }
+        parts.append("Reply with only a JSON object in exactly this shape, using the same company names as keys:\n" + json.dumps(example))
+        return "\n\n".join(parts)
     
-    def call_groq_api(self, prompt):
-        """Call Groq API"""
+    def _parse_batched(self, content, companies):
+        """Split a batched JSON reply into {section: text}; unusable sections are left out"""
+        start, end = content.find("{"), content.rfind("}")
+        try:
+            data = json.loads(content[start:end + 1]) if start != -1 else None
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return {}
+        
+        generated = {}
+        summary = data.get("summary")
+        if isinstance(summary, str) and summary.strip():
+            generated["summary"] = summary.strip()
+        
+        # Models sometimes change the case of company names
+        experience = data.get("experience")
+        answers = {str(name).lower(): bullets for name, bullets in experience.items()} if isinstance(experience, dict) else {}
+        for company in companies:
+            bullets = answers.get(company.lower())
+            if isinstance(bullets, str):
+                bullets = bullets.split("\n")
+            if not isinstance(bullets, list):
+                continue
+            points = [str(point).lstrip("•●▪◦*-– ").strip() for point in bullets]
+            points = [point for point in points if point]
+            if points:
+                generated[company] = "\n".join(f"• {point}" for point in points)
+        return generated
+    
+    def _groq_request(self, prompt, stream=False, max_tokens=300, json_mode=False):
+        """Build Groq request headers and payload"""
         GROQ_API_KEY = os.getenv("GROQ_API_KEY")
         # GROQ_API_KEY = ""
         
+        headers = {
+            "Authorization": f"Bearer {GROQ_API_KEY}",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": "llama3-8b-8192",
+            "messages": [
+                {"role": "system", "content": "You are a professional resume writer. Be concise and professional."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+            "stream": stream
+        }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return headers, payload
+    
+    def _ollama_payload(self, prompt, stream=False, num_predict=200, json_mode=False):
+        """Build Ollama payload with optimized settings"""
+        payload = {
+            "model": "phi3:mini",
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": 0.5,
+                "top_p": 0.8,
+                "top_k": 20,
+                "num_predict": num_predict,
+                "num_ctx": self.OLLAMA_NUM_CTX,
+                "stop": ["###", "---", "\n\n\n"]
+            }
+        }
+        if json_mode:
+            payload["format"] = "json"
+        return payload
+    
+    def _cached_response(self, backend, payload, use_cache):
+        """Look up a cached LLM response; returns (cache, key, value) with value None on a miss"""
+        cache = get_response_cache() if use_cache else None
+        if cache is None:
+            return None, None, None
+        key = cache.key_for(backend, payload)
+        value = cache.get(key)
+        REGISTRY.inc("llm_cache_total", backend=backend, result="miss" if value is None else "hit")
+        return cache, key, value
+    
+    def _llm_failed(self, backend, label, error):
+        """Count a failed LLM call and return the message shown instead of content"""
+        REGISTRY.inc("llm_errors_total", backend=backend, kind=getattr(error, "kind", type(error).__name__))
+        return describe_error(label, error)
+    
+    def _llm_busy(self, backend, label, error, fallback):
+        """Fall back to Smart/Local output when the backend's queue is saturated"""
+        if fallback is None:
+            return self._llm_failed(backend, label, error)
+        REGISTRY.inc("llm_degraded_total", backend=backend)
+        return self._busy_text(label, fallback())
+    
+    def _busy_text(self, label, content):
+        """Smart/Local fallback content with the banner shown in the UI"""
+        return f"⚠️ {label} is busy, so this was generated with Smart/Local:\n{content}"
+    
+    def _generate(self, backend, prompt, use_cache=True, fallback=None, queue_timeout=None):
+        """Complete prompt and return (content, degraded).
+
+        If the backend is saturated, fallback() is returned with degraded
+        True; any other failure is counted and raised as LLMError.
+        """
+        try:
+            if backend == "groq":
+                headers, payload = self._groq_request(prompt)
+                return self._complete("groq", payload, headers, use_cache, queue_timeout), False
+            return self._complete("ollama", self._ollama_payload(prompt), use_cache=use_cache, queue_timeout=queue_timeout), False
+        except LLMSaturatedError:
+            if fallback is None:
+                REGISTRY.inc("llm_errors_total", backend=backend, kind="saturated")
+                raise
+            REGISTRY.inc("llm_degraded_total", backend=backend)
+            return fallback(), True
+        except Exception as e:
+            REGISTRY.inc("llm_errors_total", backend=backend, kind=getattr(e, "kind", type(e).__name__))
+            raise
+    
+    def _post_groq(self, headers, payload):
+        """Send one Groq chat completion request and return the reply text"""
+        with REGISTRY.span("llm_call", backend="groq"):
+            response = get_client().post("groq", GROQ_API_URL, headers=headers, json=payload, timeout=30)
+            raise_for_status("groq", response)
+            try:
+                data = response.json()
+                content = data["choices"][0]["message"]["content"].strip()
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                raise LLMResponseError(f"unexpected body: {e}", backend="groq") from e
+        
+        usage = data.get("usage") or {}
+        REGISTRY.inc("llm_tokens_total", usage.get("prompt_tokens", 0), backend="groq", type="prompt")
+        REGISTRY.inc("llm_tokens_total", usage.get("completion_tokens", 0), backend="groq", type="completion")
+        return content
+    
+    def _post_ollama(self, payload):
+        """Send one Ollama generate request and return the reply text"""
+        with REGISTRY.span("llm_call", backend="ollama"):
+            response = get_client().post("ollama", OLLAMA_API_URL, json=payload, timeout=30)
+            raise_for_status("ollama", response)
+            try:
+                data = response.json()
+                content = data.get("response", "").strip()
+            except (ValueError, AttributeError) as e:
+                raise LLMResponseError(f"unexpected body: {e}", backend="ollama") from e
+        
+        REGISTRY.inc("llm_tokens_total", data.get("prompt_eval_count", 0), backend="ollama", type="prompt")
+        REGISTRY.inc("llm_tokens_total", data.get("eval_count", 0), backend="ollama", type="completion")
+        return content
+    
+    def _complete(self, backend, payload, headers=None, use_cache=True, queue_timeout=None):
+        """Get a non-streamed completion through the response cache and the shared scheduler; raises LLMError"""
+        cache, key, cached = self._cached_response(backend, payload, use_cache)
+        if cached is not None:
+            return cached
+        
+        if backend == "groq":
+            send = lambda: self._post_groq(headers, payload)
+        else:
+            send = lambda: self._post_ollama(payload)
+        content = get_scheduler().call(backend, ResponseCache.key_for(backend, payload), send, queue_timeout)
+        if cache is not None:
+            cache.set(key, content)
+        return content
+    
+    def call_groq_api(self, prompt, use_cache=True, fallback=None):
+        """Call Groq API.
+
+        Identical concurrent requests share one upstream call. If Groq is
+        saturated, fallback() (Smart/Local output) is returned instead.
+        """
+        try:
+            content, degraded = self._generate("groq", prompt, use_cache, fallback)
+        except Exception as e:
+            return describe_error("Groq API", e)
+        return self._busy_text("Groq API", content) if degraded else content
+    
+    def call_ollama_api(self, prompt, use_cache=True, fallback=None):
+        """Call Ollama API with optimized settings.
+
+        Identical concurrent requests share one upstream call. If Ollama is
+        saturated, fallback() (Smart/Local output) is returned instead.
+        """
+        try:
+            content, degraded = self._generate("ollama", prompt, use_cache, fallback)
+        except Exception as e:
+            return describe_error("Ollama", e)
+        return self._busy_text("Ollama", content) if degraded else content
+    
+    def stream_groq_api(self, prompt, use_cache=True, fallback=None):
+        """Stream Groq chat completion tokens (server-sent events)"""
+        tokens = []
         try:
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "llama3-8b-8192",
-                    "messages": [
-                        {"role": "system", "content": "You are a professional resume writer. Be concise and professional."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 300,
-                    "temperature": 0.7
-                },
-                timeout=30
-            )
+            headers, payload = self._groq_request(prompt, stream=True)
+            cache, key, cached = self._cached_response("groq", payload, use_cache)
+            if cached is not None:
+                yield cached
+                return
             
-            if response.status_code == 200:
-                return response.json()["choices"][0]["message"]["content"].strip()
-            else:
-                return "❌ Groq API error. Please try Smart/Local mode."
-                
+            scheduler = get_scheduler()
+            flight_key = ResponseCache.key_for("groq", payload)
+            flight, leader = scheduler.flight(flight_key)
+            if not leader:
+                # The same prompt is already being generated for another session
+                yield flight.result()
+                return
+            
+            try:
+                usage = {}
+                started = time.perf_counter()
+                with scheduler.slot("groq"), REGISTRY.span("llm_stream", backend="groq"):
+                    with get_client().stream("groq", GROQ_API_URL, headers=headers, json=payload, timeout=30) as response:
+                        raise_for_status("groq", response)
+                        
+                        for raw in response.iter_lines():
+                            line = raw.decode("utf-8")
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                break
+                            try:
+                                chunk = json.loads(data)
+                                token = chunk["choices"][0]["delta"].get("content")
+                            except (ValueError, KeyError, IndexError, TypeError) as e:
+                                raise LLMResponseError(f"unexpected chunk: {e}", backend="groq") from e
+                            # Groq reports usage on the final chunk
+                            usage = (chunk.get("x_groq") or {}).get("usage") or usage
+                            if token:
+                                if not tokens:
+                                    REGISTRY.observe("llm_first_token_seconds", time.perf_counter() - started, backend="groq")
+                                tokens.append(token)
+                                yield token
+            except BaseException as e:
+                scheduler.finish(flight_key, error=e)
+                raise
+            content = "".join(tokens).strip()
+            scheduler.finish(flight_key, result=content)
+            
+            REGISTRY.inc("llm_tokens_total", usage.get("prompt_tokens", 0), backend="groq", type="prompt")
+            REGISTRY.inc("llm_tokens_total", usage.get("completion_tokens", len(tokens)), backend="groq", type="completion")
+            if cache is not None:
+                cache.set(key, content)
+        
+        except LLMSaturatedError as e:
+            yield self._llm_busy("groq", "Groq API", e, fallback)
         except Exception as e:
-            return f"❌ Groq API failed: {str(e)}"
+            yield ("\n" if tokens else "") + self._llm_failed("groq", "Groq API", e)
     
-    def call_ollama_api(self, prompt):
-        """Call Ollama API with optimized settings"""
+    def stream_ollama_api(self, prompt, use_cache=True, fallback=None):
+        """Stream Ollama tokens (newline-delimited JSON)"""
+        tokens = []
         try:
-            response = requests.post("http://localhost:11434/api/generate", json={
-                "model": "phi3:mini",
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.5,
-                    "top_p": 0.8,
-                    "top_k": 20,
-                    "num_predict": 200,
-                    "num_ctx": 1024,
-                    "stop": ["###", "---", "\n\n\n"]
-                }
-            }, timeout=30)
+            payload = self._ollama_payload(prompt, stream=True)
+            cache, key, cached = self._cached_response("ollama", payload, use_cache)
+            if cached is not None:
+                yield cached
+                return
             
-            if response.status_code == 200:
-                return response.json().get("response", "").strip()
-            else:
-                return "❌ Ollama API error. Please try Smart/Local mode."
+            scheduler = get_scheduler()
+            flight_key = ResponseCache.key_for("ollama", payload)
+            flight, leader = scheduler.flight(flight_key)
+            if not leader:
+                # The same prompt is already being generated for another session
+                yield flight.result()
+                return
+            
+            try:
+                chunk = {}
+                started = time.perf_counter()
+                with scheduler.slot("ollama"), REGISTRY.span("llm_stream", backend="ollama"):
+                    with get_client().stream("ollama", OLLAMA_API_URL, json=payload, timeout=30) as response:
+                        raise_for_status("ollama", response)
+                        
+                        for raw in response.iter_lines():
+                            if not raw:
+                                continue
+                            try:
+                                chunk = json.loads(raw)
+                            except ValueError as e:
+                                raise LLMResponseError(f"unexpected chunk: {e}", backend="ollama") from e
+                            token = chunk.get("response")
+                            if token:
+                                if not tokens:
+                                    REGISTRY.observe("llm_first_token_seconds", time.perf_counter() - started, backend="ollama")
+                                tokens.append(token)
+                                yield token
+                            if chunk.get("done"):
+                                break
+            except BaseException as e:
+                scheduler.finish(flight_key, error=e)
+                raise
+            content = "".join(tokens).strip()
+            scheduler.finish(flight_key, result=content)
+            
+            # The final "done" chunk carries the token counts
+            REGISTRY.inc("llm_tokens_total", chunk.get("prompt_eval_count", 0), backend="ollama", type="prompt")
+            REGISTRY.inc("llm_tokens_total", chunk.get("eval_count", len(tokens)), backend="ollama", type="completion")
+            if cache is not None:
+                cache.set(key, content)
         
+        except LLMSaturatedError as e:
+            yield self._llm_busy("ollama", "Ollama", e, fallback)
         except Exception as e:
-            return f"❌ Ollama failed: {str(e)}"
+            yield ("\n" if tokens else "") + self._llm_failed("ollama", "Ollama", e)
+
+def collect_output(result):
+    """Render streamed generator output progressively and return the final text"""
+    if isinstance(result, str):
+        return result
+    return "".join(st.write_stream(result)).strip()
+
+@st.cache_resource
+def get_processor():
+    """Create the process-wide ResumeProcessor once; Streamlit reruns and sessions share it"""
+    started = time.perf_counter()
+    processor = ResumeProcessor()
+    if os.getenv("METRICS_PORT"):
+        # Prometheus scrape endpoint, shared by every session in this process
+        start_metrics_server(int(os.getenv("METRICS_PORT")))
+    startup = {
+        "imports_ms": IMPORT_SECONDS * 1000,
+        "init_ms": (time.perf_counter() - started) * 1000,
+    }
+    return processor, startup
 
 def main():
     st.set_page_config(page_title="Quick Resume Tailor", layout="wide")
     st.title("🚀 Quick Resume Tailor")
     st.write("Upload your PDF resume → Paste job description → Get tailored content for Canva")
     
-    processor = ResumeProcessor()
+    processor, startup = get_processor()
+    # LLM calls are queued fairly per browser session
+    ctx = get_script_run_ctx()
+    current_session.set(ctx.session_id if ctx else "default")
+    st.sidebar.caption(f"⏱️ Cold start: imports {startup['imports_ms']:.0f} ms, processor init {startup['init_ms']:.1f} ms")
     
     # Step 1: Upload PDF Resume
     st.subheader("📄 Step 1: Upload Your Current Resume (PDF)")
     pdf_file = st.file_uploader("Upload your resume", type=["pdf"])
     
     if pdf_file:
-        # Extract text from PDF
-        pdf_text = processor.extract_text_from_pdf(pdf_file)
+        # Extract text, current summary and experiences (parsed once per upload)
+        parsed = processor.parse_resume(pdf_file.getvalue())
         
-        if pdf_text:
-            # Extract current summary and experiences
-            current_summary = processor.extract_current_summary(pdf_text)
-            experience_sections = processor.extract_experience_sections(pdf_text)
+        if parsed:
+            current_summary = parsed["summary"]
+            experience_sections = parsed["experience"]
             
             st.success("✅ Resume uploaded and processed successfully!")
+            if parsed["truncated"] in ("pages", "bytes", "time"):
+                st.warning(f"⚠️ Only the first {parsed['pages_read']} of {parsed['page_count']} pages were read (PDF size limit reached)")
+            elif parsed["truncated"] == "sections_found" and parsed["pages_read"] < parsed["page_count"]:
+                st.warning(f"⚠️ Only the first {parsed['pages_read']} of {parsed['page_count']} pages were read; sections after Experience were skipped")
             
             with st.expander("📋 View Extracted Content"):
                 st.write("**Current Summary:**")
                 st.write(current_summary or "No summary found")
                 
-                st.write("**Ipsos Experience:**")
-                st.write(experience_sections.get("ipsos", "Not found"))
+                for company, experience_text in experience_sections.items():
+                    st.write(f"**{company} Experience:**")
+                    st.write(experience_text)
+                if not experience_sections:
+                    st.write("**Experience:** Not found")
                 
-                st.write("**Route Mobile Experience:**")
-                st.write(experience_sections.get("route", "Not found"))
+                for name, section_text in parsed["sections"].items():
+                    if name not in ("header", "summary", "experience") and section_text:
+                        st.write(f"**{name.title()}:**")
+                        st.write(section_text)
             
             # Step 2: Job Description
             st.subheader("📋 Step 2: Paste Job Description")
@@ -284,11 +774,17 @@ def main():
             
             if jd_input:
                 # Extract keywords
-                jd_keywords = processor.extract_keywords_from_jd(jd_input)
+                keyword_counts = processor.count_keywords_in_jd(jd_input)
+                jd_keywords = list(keyword_counts)
                 
                 if jd_keywords:
                     st.write("**🔍 Extracted Keywords:**")
-                    st.write(", ".join(jd_keywords))
+                    st.write(", ".join(f"{kw} ({count})" if count > 1 else kw for kw, count in keyword_counts.items()))
+                
+                match = processor.score_match(parsed["text"], jd_input)
+                st.metric("🎯 Resume Match", f"{match['score']:.0%}")
+                if match["missing_skills"]:
+                    st.write("**🧩 Missing Skills:** " + ", ".join(match["missing_skills"]))
                 
                 # Step 3: AI Processing
                 st.subheader("🤖 Step 3: Generate Tailored Content")
@@ -299,11 +795,13 @@ def main():
                     ["Smart/Local (Instant)", "Groq (Fast API)", "Ollama (Local AI)"],
                     index=0
                 )
+                stream_output = st.checkbox("Stream output as it is generated", value=True, help="Groq and Ollama only")
+                use_cache = not st.checkbox("Bypass response cache", value=False, help="Send a fresh request even if an identical one was answered before")
                 
-                col1, col2, col3 = st.columns(3)
+                columns = st.columns(len(experience_sections) + 1)
                 
                 # Generate Summary
-                with col1:
+                with columns[0]:
                     if st.button("📝 Generate Summary", use_container_width=True):
                         if api_choice == "Smart/Local (Instant)":
                             summary = processor.generate_tailored_summary(current_summary, jd_keywords, "Smart/Local")
@@ -312,55 +810,38 @@ def main():
                         
                         elif api_choice == "Groq (Fast API)":
                             with st.spinner("Generating with Groq..."):
-                                summary = processor.generate_tailored_summary(current_summary, jd_keywords, "Groq")
-                                st.session_state.tailored_summary = summary
+                                summary = processor.generate_tailored_summary(current_summary, jd_keywords, "Groq", stream=stream_output, use_cache=use_cache)
+                                st.session_state.tailored_summary = collect_output(summary)
                         
                         else:  # Ollama
                             with st.spinner("Generating with Ollama..."):
-                                summary = processor.generate_tailored_summary(current_summary, jd_keywords, "Ollama")
-                                st.session_state.tailored_summary = summary
+                                summary = processor.generate_tailored_summary(current_summary, jd_keywords, "Ollama", stream=stream_output, use_cache=use_cache)
+                                st.session_state.tailored_summary = collect_output(summary)
                 
-                # Generate Ipsos Experience
-                with col2:
-                    if st.button("🏢 Generate Ipsos Experience", use_container_width=True):
-                        if experience_sections.get("ipsos"):
-                            if api_choice == "Smart/Local (Instant)":
-                                exp = processor.generate_tailored_experience(experience_sections["ipsos"], "Ipsos", jd_keywords, "Smart/Local")
-                                st.session_state.ipsos_exp = exp
-                                st.success("✅ Ipsos experience generated!")
-                            
-                            elif api_choice == "Groq (Fast API)":
-                                with st.spinner("Generating with Groq..."):
-                                    exp = processor.generate_tailored_experience(experience_sections["ipsos"], "Ipsos", jd_keywords, "Groq")
-                                    st.session_state.ipsos_exp = exp
-                            
-                            else:  # Ollama
-                                with st.spinner("Generating with Ollama..."):
-                                    exp = processor.generate_tailored_experience(experience_sections["ipsos"], "Ipsos", jd_keywords, "Ollama")
-                                    st.session_state.ipsos_exp = exp
-                        else:
-                            st.error("❌ Ipsos experience not found in resume")
+                # Generate one experience per employer found in the resume
+                if "tailored_experience" not in st.session_state:
+                    st.session_state.tailored_experience = {}
                 
-                # Generate Route Experience
-                with col3:
-                    if st.button("🚀 Generate Route Experience", use_container_width=True):
-                        if experience_sections.get("route"):
+                for column, (company, experience_text) in zip(columns[1:], experience_sections.items()):
+                    with column:
+                        if st.button(f"🏢 Generate {company} Experience", key=f"generate_{company}", use_container_width=True):
                             if api_choice == "Smart/Local (Instant)":
-                                exp = processor.generate_tailored_experience(experience_sections["route"], "Route Mobile", jd_keywords, "Smart/Local")
-                                st.session_state.route_exp = exp
-                                st.success("✅ Route experience generated!")
+                                exp = processor.generate_tailored_experience(experience_text, company, jd_keywords, "Smart/Local")
+                                st.session_state.tailored_experience[company] = exp
+                                st.success(f"✅ {company} experience generated!")
                             
                             elif api_choice == "Groq (Fast API)":
                                 with st.spinner("Generating with Groq..."):
-                                    exp = processor.generate_tailored_experience(experience_sections["route"], "Route Mobile", jd_keywords, "Groq")
-                                    st.session_state.route_exp = exp
+                                    exp = processor.generate_tailored_experience(experience_text, company, jd_keywords, "Groq", stream=stream_output, use_cache=use_cache)
+                                    st.session_state.tailored_experience[company] = collect_output(exp)
                             
                             else:  # Ollama
                                 with st.spinner("Generating with Ollama..."):
-                                    exp = processor.generate_tailored_experience(experience_sections["route"], "Route Mobile", jd_keywords, "Ollama")
-                                    st.session_state.route_exp = exp
-                        else:
-                            st.error("❌ Route Mobile experience not found in resume")
+                                    exp = processor.generate_tailored_experience(experience_text, company, jd_keywords, "Ollama", stream=stream_output, use_cache=use_cache)
+                                    st.session_state.tailored_experience[company] = collect_output(exp)
+                
+                if not experience_sections:
+                    st.warning("⚠️ No experience sections found in resume")
                 
                 # Display Generated Content
                 st.subheader("📋 Step 4: Copy Content for Canva")
@@ -369,30 +850,28 @@ def main():
                     st.write("**📝 Tailored Summary:**")
                     st.text_area("Summary (Copy this)", st.session_state.tailored_summary, height=100)
                 
-                if hasattr(st.session_state, 'ipsos_exp'):
-                    st.write("**🏢 Ipsos Experience:**")
-                    st.text_area("Ipsos Experience (Copy this)", st.session_state.ipsos_exp, height=150)
-                
-                if hasattr(st.session_state, 'route_exp'):
-                    st.write("**🚀 Route Mobile Experience:**")
-                    st.text_area("Route Mobile Experience (Copy this)", st.session_state.route_exp, height=150)
+                for company in experience_sections:
+                    if company in st.session_state.tailored_experience:
+                        st.write(f"**🏢 {company} Experience:**")
+                        st.text_area(f"{company} Experience (Copy this)", st.session_state.tailored_experience[company], height=150)
                 
                 # Quick Generate All
                 st.subheader("⚡ Quick Generate All")
+                batched = st.checkbox("Generate all sections in one request", value=True, help="Groq and Ollama only: one JSON request instead of one per section")
                 if st.button("🚀 Generate All Content", use_container_width=True):
+                    progress = st.empty()
+                    done = []
+                    
                     with st.spinner("Generating all content..."):
-                        # Generate summary
-                        summary = processor.generate_tailored_summary(current_summary, jd_keywords, api_choice.split('(')[0].strip())
-                        st.session_state.tailored_summary = summary
-                        
-                        # Generate experiences
-                        if experience_sections.get("ipsos"):
-                            ipsos_exp = processor.generate_tailored_experience(experience_sections["ipsos"], "Ipsos", jd_keywords, api_choice.split('(')[0].strip())
-                            st.session_state.ipsos_exp = ipsos_exp
-                        
-                        if experience_sections.get("route"):
-                            route_exp = processor.generate_tailored_experience(experience_sections["route"], "Route Mobile", jd_keywords, api_choice.split('(')[0].strip())
-                            st.session_state.route_exp = route_exp
+                        # Sections are generated concurrently and stored as each one finishes
+                        for section, content in processor.generate_all_content(current_summary, experience_sections, jd_keywords, api_choice.split('(')[0].strip(), use_cache=use_cache, batched=batched):
+                            if section == "summary":
+                                st.session_state.tailored_summary = content
+                                done.append("Summary")
+                            else:
+                                st.session_state.tailored_experience[section] = content
+                                done.append(f"{section} experience")
+                            progress.write("✅ Ready: " + ", ".join(done))
                     
                     st.success("✅ All content generated! Copy and paste into your Canva template.")
                     st.rerun()
@@ -426,6 +905,18 @@ def main():
         - The content is optimized for ATS (Applicant Tracking Systems)
         - Copy each section separately into your Canva template
         """)
+    
+    # Per-stage latencies and error counts for this process (rendered last so it includes this run)
+    with st.sidebar.expander("🔧 Debug metrics"):
+        snapshot = REGISTRY.snapshot()
+        if snapshot["histograms"]:
+            st.write("**Latency by stage:**")
+            st.dataframe(snapshot["histograms"], hide_index=True)
+        if snapshot["counters"]:
+            st.write("**Counters:**")
+            st.dataframe(snapshot["counters"], hide_index=True)
+        if not snapshot["histograms"] and not snapshot["counters"]:
+            st.write("No metrics recorded yet")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""Headless batch mode: tailor one resume against many job descriptions.
+
+Usage:
+    python batch.py resume.pdf jds/ -o tailored.jsonl
+    python batch.py resume.pdf jds.jsonl -o tailored.jsonl --backend groq --workers 8
+
+JDs are read lazily from a directory of text files (one JD per file, the file
+name is the id) or from a JSONL file/stdin with {"id": ..., "text": ...} per
+line. Results are appended to the output JSONL as they finish, so an
+interrupted run picks up where it left off when started again.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from app import ResumeProcessor
+from llm_client import BACKEND_CONCURRENCY
+
+BACKENDS = {"local": "Smart/Local", "groq": "Groq", "ollama": "Ollama"}
+JD_EXTENSIONS = (".txt", ".md")
+
+# Seconds a Groq/Ollama section may wait for a scheduler slot and then generate. Nobody is
+# waiting on a batch run, so sections queue for the backend instead of falling back to Smart/Local
+SECTION_TIMEOUT = float(os.getenv("BATCH_SECTION_TIMEOUT", "600"))
+
+# Per-process state for the local worker pool, set once by _init_worker
+_worker = {}
+
+
+def iter_jds(source):
+    """Yield (jd_id, jd_text) pairs from a directory, a JSONL file or "-" for stdin"""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if name.lower().endswith(JD_EXTENSIONS) and os.path.isfile(path):
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    yield os.path.splitext(name)[0], f.read()
+        return
+
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line_no, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            text = record.get("text") or record.get("description") or ""
+            yield str(record.get("id", line_no)), text
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def load_checkpoint(output_path):
+    """Return the ids already written successfully to output_path"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A partially written last line from an interrupted run
+                continue
+            if "error" not in record:
+                done.add(record["id"])
+    return done
+
+
+def tailor_jd(processor, parsed, jd_id, jd_text, api_choice, use_cache=True, batched=False):
+    """Tailor the parsed resume to one JD and return the output record.
+
+    Groq/Ollama sections never fall back to Smart/Local output. Sections
+    that failed are listed under "error" so the JD counts as failed and is
+    retried on the next run.
+    """
+    started = time.perf_counter()
+    keywords = processor.extract_keywords_from_jd(jd_text)
+    record = {"id": jd_id, "keywords": keywords, "summary": "", "experience": {}}
+    errors = []
+    results = processor.generate_all_results(parsed["summary"], parsed["experience"], keywords, api_choice, SECTION_TIMEOUT, use_cache, batched,
+                                             fallback=False, queue_timeout=SECTION_TIMEOUT)
+    for section, content, error, _ in results:
+        if error is not None:
+            errors.append(f"{section}: {getattr(error, 'kind', type(error).__name__)}: {error}")
+            continue
+        if section == "summary":
+            record["summary"] = content
+        else:
+            record["experience"][section] = content
+    if errors:
+        record["error"] = "; ".join(errors)
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+def _init_worker(parsed, api_choice, use_cache):
+    _worker["processor"] = ResumeProcessor()
+    _worker["args"] = (parsed, api_choice, use_cache)
+
+
+def _tailor_in_worker(jd_id, jd_text):
+    parsed, api_choice, use_cache = _worker["args"]
+    return tailor_jd(_worker["processor"], parsed, jd_id, jd_text, api_choice, use_cache)
+
+
+def run_batch(resume_path, source, output_path, backend="local", workers=None, use_cache=True, restart=False, batched=False):
+    """Tailor the resume to every JD in source, appending JSONL records to output_path.
+
+    Returns (written, failed, skipped) counts.
+    """
+    processor = ResumeProcessor()
+    with open(resume_path, "rb") as f:
+        # Batch runs only generate, so pages after the summary and experience are not needed
+        parsed = processor.parse_resume(f.read(), processor.GENERATION_SECTIONS)
+    if not parsed:
+        raise ValueError(f"Could not extract text from {resume_path}")
+
+    api_choice = BACKENDS[backend]
+    if restart and os.path.exists(output_path):
+        os.remove(output_path)
+    done = load_checkpoint(output_path)
+
+    # CPU-bound local generation scales across cores; LLM backends are I/O bound
+    if api_choice == "Smart/Local":
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(parsed, api_choice, use_cache))
+        submit = lambda jd_id, jd_text: executor.submit(_tailor_in_worker, jd_id, jd_text)
+    else:
+        # Every JD runs all its sections at once; by default run only as many JDs as the backend admits sections
+        sections = 1 if batched else 1 + sum(1 for text in parsed["experience"].values() if text)
+        workers = workers or max(1, BACKEND_CONCURRENCY.get(backend, 4) // sections)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        submit = lambda jd_id, jd_text: executor.submit(tailor_jd, processor, parsed, jd_id, jd_text, api_choice, use_cache, batched)
+
+    # Keep only a bounded window of JDs in flight so memory stays constant
+    max_in_flight = workers * 2
+    written = failed = skipped = 0
+    in_flight = {}
+
+    def drain(block_until):
+        nonlocal written, failed
+        while len(in_flight) > block_until:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                jd_id = in_flight.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    record = {"id": jd_id, "error": str(e)}
+                if "error" in record:
+                    failed += 1
+                else:
+                    written += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        try:
+            for jd_id, jd_text in iter_jds(source):
+                if jd_id in done:
+                    skipped += 1
+                    continue
+                in_flight[submit(jd_id, jd_text)] = jd_id
+                drain(max_in_flight - 1)
+            drain(0)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return written, failed, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tailor one resume against many job descriptions")
+    parser.add_argument("resume", help="Resume PDF")
+    parser.add_argument("jds", help="Directory of .txt/.md JDs, a JSONL file, or - for JSONL on stdin")
+    parser.add_argument("-o", "--output", required=True, help="Output JSONL (appended to; doubles as the checkpoint)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="local")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (local) or concurrent requests (groq/ollama)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
+    parser.add_argument("--restart", action="store_true", help="Discard existing output instead of resuming")
+    parser.add_argument("--batched", action="store_true", help="One JSON request per JD for all sections (groq/ollama)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        written, failed, skipped = run_batch(args.resume, args.jds, args.output, args.backend, args.workers, not args.no_cache, args.restart, args.batched)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume.", file=sys.stderr)
+        return 130
+    print(f"Done in {time.perf_counter() - started:.1f}s: {written} written, {failed} failed, {skipped} already done", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
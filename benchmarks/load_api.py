@@ -0,0 +1,133 @@
+"""Load test the HTTP API against a local mock Groq/Ollama backend.
+
+Usage:
+    python -m benchmarks.load_api --concurrency 32 --duration 10
+    python -m benchmarks.load_api --backend ollama --mock-latency 0.5 --server-workers 4
+
+Starts the mock LLM server and ``api.py`` in a subprocess, then drives every
+endpoint from a pool of client threads and reports throughput, p50/p95
+latency and error counts per endpoint.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks import synthetic
+from benchmarks.mock_llm import MockLLMServer
+
+
+def _wait_until_up(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(base_url + "/healthz", timeout=1).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API did not start at {base_url}")
+
+
+def _requests(backend, seed):
+    """Build one (endpoint, kwargs) request per endpoint for a synthetic candidate"""
+    pdf = synthetic.resume_pdf(2, "dated", seed=seed)
+    jd = synthetic.job_description(400, 0.1, seed=seed)
+    experience = {"Acme Corp": "• Built Django REST APIs\n• Deployed services on AWS with Docker"}
+    body = {"summary": "Backend developer", "jd": jd, "backend": backend, "use_cache": False}
+    return [
+        ("/parse", {"data": pdf, "headers": {"Content-Type": "application/pdf"}}),
+        ("/keywords", {"json": {"jd": jd}}),
+        ("/summary", {"json": body}),
+        ("/experience", {"json": dict(body, company="Acme Corp", experience=experience["Acme Corp"])}),
+        ("/generate-all", {"json": dict(body, experience=experience)}),
+    ]
+
+
+def run_load(base_url, backend="groq", concurrency=16, duration=10.0):
+    """Fire requests at every endpoint for duration seconds and return per-endpoint stats"""
+    plans = [_requests(backend, seed) for seed in range(8)]
+    samples = {}
+    errors = {}
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def client(worker):
+        session = requests.Session()
+        # Each client thread is one caller for the API's fair queueing
+        session.headers["X-Session-Id"] = f"client-{worker}"
+        i = worker
+        while time.time() < deadline:
+            endpoint, kwargs = plans[i % len(plans)][i % 5]
+            i += 1
+            started = time.perf_counter()
+            try:
+                ok = session.post(base_url + endpoint, timeout=120, **kwargs).ok
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                samples.setdefault(endpoint, []).append(elapsed)
+                if not ok:
+                    errors[endpoint] = errors.get(endpoint, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    wall = time.perf_counter() - started
+
+    results = {}
+    for endpoint, times in sorted(samples.items()):
+        times.sort()
+        results[endpoint] = {
+            "requests": len(times),
+            "errors": errors.get(endpoint, 0),
+            "throughput_per_s": round(len(times) / wall, 1),
+            "p50_ms": round(times[len(times) // 2] * 1000, 1),
+            "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 1),
+        }
+    total = sum(len(times) for times in samples.values())
+    results["total"] = {"requests": total, "errors": sum(errors.values()), "throughput_per_s": round(total / wall, 1)}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the resume tailoring HTTP API")
+    parser.add_argument("--backend", choices=["local", "groq", "ollama"], default="groq")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--mock-latency", type=float, default=0.2, help="Mock LLM response latency in seconds")
+    parser.add_argument("--server-workers", type=int, default=1, help="API server processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args(argv)
+
+    with MockLLMServer(latency=args.mock_latency) as mock:
+        env = dict(os.environ, GROQ_API_URL=mock.groq_url, OLLAMA_API_URL=mock.ollama_url, LLM_CACHE_PATH="")
+        env.setdefault("GROQ_API_KEY", "benchmark")
+        server = subprocess.Popen([sys.executable, "api.py", "--port", str(args.port), "--workers", str(args.server_workers)], env=env)
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            _wait_until_up(base_url)
+            results = run_load(base_url, args.backend, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        print(f"Mock LLM served {mock.requests} upstream requests")
+
+    for endpoint, stats in results.items():
+        print(f"{endpoint:15s} " + "  ".join(f"{key} {value}" for key, value in stats.items()))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
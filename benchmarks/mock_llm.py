@@ -0,0 +1,159 @@
+"""Local mock of the Groq chat-completions and Ollama generate endpoints.
+
+Responses are canned text delivered after a configurable latency, streamed
+token by token when the request asks for it. Use as a context manager:
+
+    with MockLLMServer(latency=0.05) as server:
+        os.environ["GROQ_API_URL"] = server.groq_url
+        os.environ["OLLAMA_API_URL"] = server.ollama_url
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPONSE_TEXT = (
+    "• Built Python and Django REST APIs serving millions of requests\n"
+    "• Deployed containerized services on AWS with Docker and Kubernetes\n"
+    "• Automated CI/CD pipelines, cutting release time by 30%\n"
+    "• Optimized PostgreSQL queries, improving latency by 25%"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Avoid Nagle/delayed-ACK stalls adding ~40 ms to every response
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        request = json.loads(body or b"{}")
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            status = server.status_sequence.pop(0) if server.status_sequence else 200
+
+        time.sleep(server.latency)
+        if status != 200:
+            headers = {"Retry-After": server.retry_after} if server.retry_after is not None else {}
+            self._send_json(status, {"error": "mock failure"}, headers)
+            return
+
+        tokens = server.text.split(" ")
+        tokens = [token + " " for token in tokens[:-1]] + tokens[-1:]
+        groq = "/chat/completions" in self.path
+        if not request.get("stream"):
+            if groq:
+                self._send_json(200, {
+                    "choices": [{"message": {"role": "assistant", "content": server.text}}],
+                    "usage": {"prompt_tokens": len(json.dumps(request)) // 4, "completion_tokens": len(tokens)},
+                })
+            else:
+                self._send_json(200, {"response": server.text, "done": True, "eval_count": len(tokens)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if groq else "application/x-ndjson")
+        # Chunked like the real backends, so clients see each token as it is sent
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                if groq:
+                    self._send_chunk(b"data: " + json.dumps({"choices": [{"delta": {"content": token}}]}).encode() + b"\n\n")
+                else:
+                    self._send_chunk(json.dumps({"response": token, "done": False}).encode() + b"\n")
+                time.sleep(server.token_latency)
+            self._send_chunk(b"data: [DONE]\n\n" if groq else json.dumps({"response": "", "done": True}).encode() + b"\n")
+            self._send_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading (e.g. after the first token)
+            self.close_connection = True
+
+    def _send_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockLLMServer:
+    """Threaded mock LLM backend on localhost.
+
+    latency is the delay before the first byte, token_latency the delay
+    between streamed tokens; status_sequence lets tests script failures
+    (e.g. [429, 200]), and retry_after is sent as the Retry-After header on
+    those failures.
+    """
+
+    def __init__(self, latency=0.05, token_latency=0.002, text=RESPONSE_TEXT, status_sequence=None, retry_after=None, port=0):
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.token_latency = token_latency
+        self._server.text = text
+        self._server.status_sequence = list(status_sequence or [])
+        self._server.retry_after = retry_after
+        self._server.requests = 0
+        self._server.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def groq_url(self):
+        return self.base_url + "/openai/v1/chat/completions"
+
+    @property
+    def ollama_url(self):
+        return self.base_url + "/api/generate"
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a mock Groq/Ollama server")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with MockLLMServer(latency=args.latency, port=args.port) as server:
+        print(f"GROQ_API_URL={server.groq_url}")
+        print(f"OLLAMA_API_URL={server.ollama_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
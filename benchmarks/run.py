@@ -0,0 +1,168 @@
+"""Benchmark the ResumeProcessor pipeline on synthetic resumes and JDs.
+
+Usage:
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --compare bench.json
+
+Each stage reports throughput, p50/p95/mean latency and peak traced memory.
+Groq and Ollama are replaced by a local mock server so LLM stages measure
+only our client overhead plus the configured mock latency.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+from benchmarks.mock_llm import MockLLMServer
+
+
+def _percentile(sorted_samples, pct):
+    index = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+
+def measure(fn, iterations, warmup=1):
+    """Time fn() and return latency percentiles, throughput and peak memory"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    # Memory is traced in a separate run so tracing overhead doesn't skew timings
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        "iterations": iterations,
+        "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(_percentile(samples, 95) * 1000, 3),
+        "mean_ms": round(total / iterations * 1000, 3),
+        "throughput_per_s": round(iterations / total, 2) if total else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(quick=False, mock_latency=0.05):
+    """Run every stage and return the results document"""
+    page_counts = [1, 5] if quick else [1, 5, 20, 50]
+    jd_sizes = [(200, 0.05), (2000, 0.05)] if quick else [(200, 0.05), (1000, 0.05), (1000, 0.2), (5000, 0.05), (5000, 0.2)]
+    iterations = 5 if quick else 20
+    llm_iterations = 3 if quick else 10
+
+    with MockLLMServer(latency=mock_latency) as server:
+        # Point the app at the mock and disable the response cache before it is imported
+        os.environ["GROQ_API_URL"] = server.groq_url
+        os.environ["OLLAMA_API_URL"] = server.ollama_url
+        os.environ["LLM_CACHE_PATH"] = ""
+        os.environ.setdefault("GROQ_API_KEY", "benchmark")
+        from app import ResumeProcessor
+
+        processor = ResumeProcessor()
+        stages = {}
+
+        for layout in synthetic.LAYOUTS:
+            for pages in page_counts:
+                pdf = synthetic.resume_pdf(pages, layout, seed=pages)
+                text = processor.extract_text_from_pdf(io.BytesIO(pdf))
+                tag = f"pages={pages},layout={layout}"
+                stages[f"pdf_extract[{tag}]"] = measure(lambda: processor.extract_text_from_pdf(io.BytesIO(pdf)), iterations)
+                stages[f"section_parse[{tag}]"] = measure(lambda: processor.parse_sections(text), iterations)
+                stages[f"resume_read[{tag}]"] = measure(lambda: processor.read_resume(pdf, processor.GENERATION_SECTIONS), iterations)
+
+        parsed = processor.parse_sections("\n".join(synthetic.resume_lines(2, "dated", seed=1)))
+        experience = {job["company"]: job["text"] for job in parsed["experience"]}
+        company, experience_text = next(iter(experience.items()))
+
+        for words, density in jd_sizes:
+            jd = synthetic.job_description(words, density, seed=words)
+            stages[f"keywords[words={words},density={density}]"] = measure(lambda: processor.extract_keywords_from_jd(jd), iterations * 5)
+
+        jd_keywords = processor.extract_keywords_from_jd(synthetic.job_description(500, 0.1))
+        stages["smart_local_summary"] = measure(lambda: processor.generate_tailored_summary(parsed["summary"], jd_keywords), iterations * 5)
+        stages["smart_local_experience"] = measure(lambda: processor.generate_tailored_experience(experience_text, company, jd_keywords), iterations * 5)
+        stages["generate_all[backend=Smart/Local]"] = measure(lambda: list(processor.generate_all_content(parsed["summary"], experience, jd_keywords)), iterations)
+
+        for backend in ("Groq", "Ollama"):
+            stages[f"llm_call[backend={backend}]"] = measure(
+                lambda: processor.generate_tailored_summary(parsed["summary"], jd_keywords, backend, use_cache=False), llm_iterations)
+            stages[f"llm_first_token[backend={backend}]"] = measure(
+                lambda: next(iter(processor.generate_tailored_summary(parsed["summary"], jd_keywords, backend, stream=True, use_cache=False))), llm_iterations)
+            stages[f"generate_all[backend={backend}]"] = measure(
+                lambda: list(processor.generate_all_content(parsed["summary"], experience, jd_keywords, backend, use_cache=False)), llm_iterations)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": _git_commit(),
+            "quick": quick,
+            "mock_latency_s": mock_latency,
+        },
+        "stages": stages,
+    }
+
+
+def compare(current, baseline, threshold=1.2):
+    """Print p50 ratios against a previous run; return the stages that regressed"""
+    regressions = []
+    for stage, result in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{stage:55s} {before['p50_ms']:10.3f} -> {result['p50_ms']:10.3f} ms  x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(stage)
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume tailoring pipeline")
+    parser.add_argument("--output", default="bench.json", help="Where to write the JSON results")
+    parser.add_argument("--quick", action="store_true", help="Fewer sizes and iterations")
+    parser.add_argument("--mock-latency", type=float, default=0.05, help="Mock LLM response latency in seconds")
+    parser.add_argument("--compare", help="Previous results JSON to compare p50 latencies against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="p50 ratio above which a stage counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick, args.mock_latency)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for stage, result in results["stages"].items():
+        print(f"{stage:55s} p50 {result['p50_ms']:10.3f} ms  p95 {result['p95_ms']:10.3f} ms  {result['throughput_per_s']:>10} /s  peak {result['peak_kib']:>9} KiB")
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
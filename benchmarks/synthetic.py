@@ -0,0 +1,79 @@
+"""Seeded generators for synthetic resumes and job descriptions."""
+import io
+import random
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from keywords import DEFAULT_KEYWORDS
+
+FILLER = (
+    "team product customers delivered improved designed scalable reliable platform services "
+    "stakeholders requirements ownership performance latency features migration reporting "
+    "collaborated mentored reviewed launched automated monitoring production quality"
+).split()
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Soylent"]
+TITLES = ["Software Engineer", "Backend Developer", "Senior Software Engineer", "Data Engineer", "Platform Engineer"]
+LAYOUTS = ("classic", "dated")
+
+
+def _sentence(rng, keywords, words=12, keyword_density=0.2):
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(keywords) if rng.random() < keyword_density else rng.choice(FILLER))
+    return " ".join(out).capitalize()
+
+
+def resume_lines(pages=1, layout="classic", seed=0):
+    """Return the text lines of a synthetic resume spanning roughly `pages` pages"""
+    rng = random.Random(seed)
+    lines = ["Jane Doe", "jane.doe@example.com | +1 555 0100", "Professional Summary"]
+    lines += [_sentence(rng, DEFAULT_KEYWORDS, 14) for _ in range(3)]
+    lines.append("Experience")
+
+    # ~45 lines fit on a page
+    jobs = max(2, pages * 3)
+    bullets = max(4, (pages * 45 - 20) // jobs - 2)
+    for i in range(jobs):
+        company = COMPANIES[i % len(COMPANIES)] + ("" if i < len(COMPANIES) else f" {i}")
+        title = rng.choice(TITLES)
+        start = 2024 - 2 * (i + 1)
+        if layout == "dated":
+            lines.append(title)
+            lines.append(f"{company} | Jan {start} - Dec {start + 2}")
+        else:
+            lines.append(f"{title} - {company}")
+        lines += ["• " + _sentence(rng, DEFAULT_KEYWORDS, 10) for _ in range(bullets)]
+
+    lines += ["Skills", ", ".join(rng.sample(DEFAULT_KEYWORDS, 15))]
+    lines += ["Projects"] + ["• " + _sentence(rng, DEFAULT_KEYWORDS, 10) for _ in range(3)]
+    lines += ["Education", "B.Tech Computer Science, 2016"]
+    return lines
+
+
+def resume_pdf(pages=1, layout="classic", seed=0):
+    """Render a synthetic resume to PDF bytes"""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    y = 750
+    for line in resume_lines(pages, layout, seed):
+        if y < 60:
+            pdf.showPage()
+            y = 750
+        pdf.drawString(54, y, line[:110])
+        y -= 15
+    pdf.save()
+    return buffer.getvalue()
+
+
+def job_description(words=300, keyword_density=0.05, seed=0):
+    """Return a synthetic JD of about `words` words with the given share of skill keywords"""
+    rng = random.Random(seed)
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        n = min(remaining, 15)
+        sentences.append(_sentence(rng, DEFAULT_KEYWORDS, n, keyword_density) + ".")
+        remaining -= n
+    return " ".join(sentences)
@@ -0,0 +1,150 @@
+import json
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Canonical skills detected in job descriptions, in display order
+DEFAULT_KEYWORDS = [
+    "python", "django", "flask", "fastapi", "api", "rest", "sql", "postgresql",
+    "mysql", "aws", "docker", "kubernetes", "redis", "celery", "git", "ci/cd",
+    "machine learning", "ml", "ai", "javascript", "react", "microservices",
+    "cloud", "backend", "frontend", "database", "nosql", "mongodb", "java",
+    "spring", "nodejs", "vue", "angular", "jenkins", "devops"
+]
+
+# Alternative spellings mapped to their canonical skill
+DEFAULT_ALIASES = {
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "node.js": "nodejs",
+    "node js": "nodejs",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "mongo": "mongodb",
+    "restful": "rest",
+    "apis": "api",
+    "databases": "database",
+    "micro-services": "microservices",
+    "amazon web services": "aws",
+    "artificial intelligence": "ai",
+    "continuous integration": "ci/cd",
+    "ci-cd": "ci/cd",
+    "back-end": "backend",
+    "back end": "backend",
+    "front-end": "frontend",
+    "front end": "frontend",
+}
+
+KeywordMatch = namedtuple("KeywordMatch", ["keyword", "term", "start", "end"])
+
+
+def _trie_pattern(terms):
+    """Build a regex alternation from a prefix trie so matching cost grows with text length, not term count"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # Prefer the longer term, fall back to the shorter one
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Compiled word-boundary matcher for a skill taxonomy with aliases.
+
+    The taxonomy is compiled once into a single regex; each match reports
+    the canonical skill, the matched term and its position in the text.
+    """
+
+    def __init__(self, keywords, aliases=None):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords))
+        self.aliases = {alias.lower(): canonical.lower() for alias, canonical in (aliases or {}).items()}
+        self._order = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self._canonical = {keyword: keyword for keyword in self.keywords}
+        for alias, canonical in self.aliases.items():
+            if canonical in self._order:
+                self._canonical.setdefault(alias, canonical)
+
+        terms = [term for term in self._canonical if term]
+        body = _trie_pattern(terms) if terms else "(?!)"
+        # Terms may contain punctuation (ci/cd, node.js), so boundaries are alphanumeric lookarounds
+        self._pattern = re.compile(r"(?<![a-z0-9])(" + body + r")(?![a-z0-9])")
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a taxonomy from JSON: a list of skills or {"keywords": [...], "aliases": {...}}"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return cls(data)
+        return cls(data.get("keywords", []), data.get("aliases", {}))
+
+    def finditer(self, text):
+        """Yield a KeywordMatch for every skill mention in text"""
+        for match in self._pattern.finditer(text.lower()):
+            term = match.group(1)
+            yield KeywordMatch(self._canonical[term], term, match.start(1), match.end(1))
+
+    def counts(self, text):
+        """Return {skill: mention count} in taxonomy order"""
+        counts = {}
+        for match in self.finditer(text):
+            counts[match.keyword] = counts.get(match.keyword, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: self._order[item[0]]))
+
+    def extract(self, text):
+        """Return the distinct skills mentioned in text, in taxonomy order"""
+        return list(self.counts(text))
+
+
+def load_default_matcher():
+    """Build the matcher from KEYWORD_TAXONOMY_PATH if set, else the built-in taxonomy"""
+    path = os.getenv("KEYWORD_TAXONOMY_PATH")
+    if path:
+        return KeywordMatcher.from_file(path)
+    return KeywordMatcher(DEFAULT_KEYWORDS, DEFAULT_ALIASES)
+
+
+# Compiled once at import and shared by every ResumeProcessor
+DEFAULT_MATCHER = load_default_matcher()
+
+
+@lru_cache(maxsize=None)
+def load_stopwords(language="english"):
+    """Return NLTK stopwords, loaded once per process.
+
+    Nothing is downloaded unless NLTK_AUTO_DOWNLOAD=1; if the corpus is not
+    installed an empty set is returned instead of touching the network.
+    """
+    try:
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words(language))
+    except ImportError:
+        return frozenset()
+    except LookupError:
+        if os.getenv("NLTK_AUTO_DOWNLOAD") != "1":
+            return frozenset()
+
+    import nltk
+    try:
+        nltk.download("stopwords", quiet=True, raise_on_error=True)
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words(language))
+    except Exception:
+        return frozenset()
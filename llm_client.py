@@ -0,0 +1,227 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+from metrics import REGISTRY
+
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+OLLAMA_API_URL = os.getenv("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+
+# Max simultaneous in-flight requests per backend, shared by every session in the process
+BACKEND_CONCURRENCY = {
+    "groq": int(os.getenv("GROQ_MAX_CONCURRENCY", "8")),
+    "ollama": int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2")),
+}
+
+# Status codes worth retrying: rate limits and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Base class for LLM backend failures; kind is a stable label for metrics and messages"""
+    kind = "error"
+
+    def __init__(self, message, backend=None, status=None):
+        super().__init__(message)
+        self.backend = backend
+        self.status = status
+
+
+class LLMConnectionError(LLMError):
+    kind = "connection"
+
+
+class LLMTimeoutError(LLMError):
+    kind = "timeout"
+
+
+class LLMHTTPError(LLMError):
+    kind = "http_error"
+
+
+class LLMAuthError(LLMHTTPError):
+    kind = "auth"
+
+
+class LLMRateLimitError(LLMHTTPError):
+    kind = "rate_limited"
+
+
+class LLMServerError(LLMHTTPError):
+    kind = "server_error"
+
+
+class LLMSaturatedError(LLMError):
+    """Too many requests are already waiting for the backend"""
+    kind = "saturated"
+
+
+class LLMResponseError(LLMError):
+    """The backend answered 200 but the body could not be understood"""
+    kind = "bad_response"
+
+
+def raise_for_status(backend, response):
+    """Raise the LLMError subclass matching a non-200 response"""
+    status = response.status_code
+    if status == 200:
+        return
+    if status in (401, 403):
+        error = LLMAuthError
+    elif status == 429:
+        error = LLMRateLimitError
+    elif status >= 500:
+        error = LLMServerError
+    else:
+        error = LLMHTTPError
+    raise error(f"HTTP {status}", backend=backend, status=status)
+
+
+def describe_error(backend_label, error):
+    """Format an error as the message shown in place of generated content"""
+    if isinstance(error, LLMError):
+        reason = {
+            "connection": "could not connect",
+            "timeout": "timed out",
+            "auth": "rejected the API key",
+            "rate_limited": "is rate limiting requests",
+            "server_error": "had a server error",
+            "http_error": "returned an error",
+            "bad_response": "returned an unexpected response",
+            "saturated": "is busy",
+        }.get(error.kind, "failed")
+        return f"❌ {backend_label} {reason} ({error}). Please try Smart/Local mode."
+    return f"❌ {backend_label} failed: {str(error)}"
+
+
+class LLMClient:
+    """Process-wide HTTP layer for the LLM backends.
+
+    Keeps one pooled keep-alive ``requests.Session`` per backend and retries
+    rate limits and transient failures with jittered exponential backoff
+    (honouring ``Retry-After``). How many requests run at once is decided
+    by ``llm_scheduler``, which every caller goes through; the connection
+    pools are only sized to match.
+    """
+
+    def __init__(self, max_retries=3, backoff_base=0.5, backoff_max=8.0, retry_after_max=30.0, concurrency=None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.concurrency = dict(BACKEND_CONCURRENCY if concurrency is None else concurrency)
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session(self, backend):
+        """Return the shared session for a backend, creating it on first use"""
+        with self._lock:
+            if backend not in self._sessions:
+                # Imported here so the app can start without loading requests/urllib3
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                pool_size = max(self.concurrency.get(backend, 4), 1)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[backend] = session
+            return self._sessions[backend]
+
+    def post(self, backend, url, json=None, headers=None, timeout=30):
+        """POST to a backend with pooling and retries"""
+        return self._send(backend, self.session(backend), url, json, headers, timeout, stream=False)
+
+    @contextmanager
+    def stream(self, backend, url, json=None, headers=None, timeout=30):
+        """POST with a streamed response body.
+
+        Retries apply until the response headers arrive.
+        """
+        response = self._send(backend, self.session(backend), url, json, headers, timeout, stream=True)
+        try:
+            yield response
+        finally:
+            response.close()
+
+    def _send(self, backend, session, url, json, headers, timeout, stream):
+        import requests
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = session.post(url, json=json, headers=headers, timeout=timeout, stream=stream)
+            except requests.ReadTimeout as e:
+                # The backend accepted the request but is still generating; resending would only pile more work on it
+                REGISTRY.inc("llm_requests_total", backend=backend, status="timeout")
+                raise LLMTimeoutError(str(e), backend=backend) from e
+            except (requests.ConnectionError, requests.Timeout) as e:
+                kind = "timeout" if isinstance(e, requests.Timeout) else "connection"
+                REGISTRY.inc("llm_requests_total", backend=backend, status=kind)
+                if attempt >= self.max_retries:
+                    error = LLMTimeoutError if kind == "timeout" else LLMConnectionError
+                    raise error(str(e), backend=backend) from e
+                REGISTRY.inc("llm_retries_total", backend=backend, reason=kind)
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            REGISTRY.observe("llm_request_seconds", time.perf_counter() - started, backend=backend)
+            REGISTRY.inc("llm_requests_total", backend=backend, status=str(response.status_code))
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                REGISTRY.inc("llm_retries_total", backend=backend, reason=str(response.status_code))
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            return response
+
+    def close(self):
+        """Close all pooled sessions"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def _backoff(self, attempt):
+        # Full jitter keeps retries from many sessions from arriving in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, response):
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.retry_after_max)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide LLMClient"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient(
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+                backoff_base=float(os.getenv("LLM_BACKOFF_BASE", "0.5")),
+                backoff_max=float(os.getenv("LLM_BACKOFF_MAX", "8")),
+            )
+        return _client
@@ -0,0 +1,168 @@
+"""Process-wide admission control and request coalescing for the LLM backends.
+
+Every Streamlit session shares one ``LLMScheduler``. Identical in-flight
+requests are collapsed into a single upstream call (single-flight), and each
+backend admits a bounded number of concurrent calls. Waiting callers are
+served round-robin per session so one user's "Generate All" can't starve the
+others. When a backend's queue is full, or a caller has waited longer than
+``queue_timeout``, ``LLMSaturatedError`` is raised so the caller can fall
+back to Smart/Local generation instead of hanging.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from llm_client import BACKEND_CONCURRENCY, LLMError, LLMSaturatedError
+from metrics import REGISTRY
+
+# Who is asking: set once per Streamlit session (or batch run) and used for fair queueing
+current_session = contextvars.ContextVar("llm_session", default="default")
+
+
+class _BackendQueue:
+    def __init__(self, limit, max_queue):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.queued = 0
+        # Session -> waiting callers; sessions are served in rotation
+        self.waiting = OrderedDict()
+
+
+class LLMScheduler:
+    """Single-flight and fair, bounded admission for LLM calls"""
+
+    def __init__(self, concurrency=None, max_queue=32, queue_timeout=10.0):
+        self.concurrency = dict(BACKEND_CONCURRENCY if concurrency is None else concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._queues = {}
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def call(self, backend, key, fn, timeout=None):
+        """Return fn() for the first caller with key; concurrent callers with the same key share its result.
+
+        timeout overrides queue_timeout for this call's wait for a slot.
+        """
+        flight, leader = self.flight(key)
+        if not leader:
+            return flight.result()
+        try:
+            with self.slot(backend, timeout):
+                result = fn()
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result=result)
+        return result
+
+    def flight(self, key):
+        """Join the in-flight request for key, or start one.
+
+        Returns (future, leader). The leader must call ``finish`` with the
+        result or error; everyone else waits on the future.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                REGISTRY.inc("llm_coalesced_total")
+                return flight, False
+            flight = self._flights[key] = Future()
+            return flight, True
+
+    def finish(self, key, result=None, error=None):
+        """Publish the leader's result (or error) to callers waiting on key"""
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        if flight is None:
+            return
+        if error is None:
+            flight.set_result(result)
+        elif isinstance(error, Exception):
+            flight.set_exception(error)
+        else:
+            # The leader was cancelled (e.g. its stream was abandoned)
+            flight.set_exception(LLMError("the shared request was cancelled"))
+
+    @contextmanager
+    def slot(self, backend, timeout=None):
+        """Hold one of the backend's concurrency slots, queueing fairly behind other sessions"""
+        timeout = self.queue_timeout if timeout is None else timeout
+        queued = time.perf_counter()
+        waiter = None
+        with self._lock:
+            queue = self._queue(backend)
+            if queue.active < queue.limit and not queue.queued:
+                queue.active += 1
+            elif queue.queued >= queue.max_queue:
+                REGISTRY.inc("llm_rejected_total", backend=backend, reason="queue_full")
+                raise LLMSaturatedError(f"{queue.queued} requests already queued", backend=backend)
+            else:
+                waiter = threading.Event()
+                queue.waiting.setdefault(current_session.get(), deque()).append(waiter)
+                queue.queued += 1
+
+        if waiter is not None and not waiter.wait(timeout):
+            with self._lock:
+                # The slot may have been handed over just as the wait timed out
+                if not waiter.is_set():
+                    self._forget(queue, waiter)
+                    REGISTRY.inc("llm_rejected_total", backend=backend, reason="queue_timeout")
+                    raise LLMSaturatedError(f"no free slot after {timeout:g}s", backend=backend)
+
+        REGISTRY.observe("llm_scheduler_wait_seconds", time.perf_counter() - queued, backend=backend)
+        try:
+            yield
+        finally:
+            self._release(queue)
+
+    def _queue(self, backend):
+        queue = self._queues.get(backend)
+        if queue is None:
+            queue = self._queues[backend] = _BackendQueue(max(self.concurrency.get(backend, 4), 1), self.max_queue)
+        return queue
+
+    def _release(self, queue):
+        with self._lock:
+            if not queue.waiting:
+                queue.active -= 1
+                return
+            # Hand the slot straight to the next session in rotation
+            session, waiters = next(iter(queue.waiting.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                queue.waiting.move_to_end(session)
+            else:
+                del queue.waiting[session]
+            queue.queued -= 1
+            waiter.set()
+
+    def _forget(self, queue, waiter):
+        for session, waiters in queue.waiting.items():
+            if waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del queue.waiting[session]
+                queue.queued -= 1
+                return
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide LLMScheduler"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(
+                max_queue=int(os.getenv("LLM_MAX_QUEUE", "32")),
+                queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT", "10")),
+            )
+        return _scheduler
@@ -0,0 +1,158 @@
+"""Data-driven Smart/Local generation.
+
+Summary sentences and per-employer bullet templates are loaded from a JSON
+taxonomy (``data/skill_taxonomy.json`` by default) and indexed by skill once,
+so generating a section is a single pass over the JD keywords. Employers
+without templates get their own resume bullets ranked the same way.
+"""
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+
+from keywords import DEFAULT_MATCHER
+from sections import EMPLOYER_PATTERNS, TITLE_WORDS
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json")
+
+# Score of an employer's core bullets, so they fill the section ahead of unrelated extras
+BASE_WEIGHT = 0.5
+
+_BULLET_CHARS = "•●▪◦*-– "
+_TITLE = re.compile(r"\b(?:" + "|".join(re.escape(word) for word in TITLE_WORDS) + r")s?\b")
+
+
+class _BulletSet:
+    """Bullet texts with a skill -> bullet ids index and each bullet's base score"""
+
+    def __init__(self, texts, skills, base):
+        # Imported here so the app can start without loading numpy
+        import numpy as np
+
+        self.texts = texts
+        self.base = np.asarray(base, dtype=float)
+        index = {}
+        for i, bullet_skills in enumerate(skills):
+            for skill in dict.fromkeys(s.lower() for s in bullet_skills):
+                index.setdefault(skill, []).append(i)
+        self.index = {skill: np.asarray(ids, dtype=np.intp) for skill, ids in index.items()}
+
+
+class LocalEngine:
+    """Rank summary sentences and experience bullets by weighted JD keyword overlap"""
+
+    def __init__(self, taxonomy, keyword_matcher=None):
+        self.keyword_matcher = keyword_matcher or DEFAULT_MATCHER
+        self.weights = {skill.lower(): float(weight) for skill, weight in taxonomy.get("weights", {}).items()}
+
+        summary = taxonomy.get("summary", {})
+        self.opening = summary.get("opening", "")
+        self.closing = summary.get("closing", "")
+        self.max_summary = summary.get("max_templates", 5)
+        templates = summary.get("templates", [])
+        self._summary = _BulletSet([t["text"] for t in templates], [t.get("skills", []) for t in templates], [0.0] * len(templates))
+
+        self._employers = []
+        for employer in taxonomy.get("employers", []):
+            bullets = employer.get("bullets", [])
+            self._employers.append((_slug(employer["match"]), _BulletSet(
+                [b["text"] for b in bullets],
+                [b.get("skills", []) for b in bullets],
+                [BASE_WEIGHT if b.get("base") else 0.0 for b in bullets],
+            )))
+
+        self._employer_for = lru_cache(maxsize=1024)(self._find_employer)
+        self._own_bullets = lru_cache(maxsize=256)(self._index_own_bullets)
+
+    @classmethod
+    def from_file(cls, path, keyword_matcher=None):
+        """Load a taxonomy JSON file"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), keyword_matcher)
+
+    def texts(self):
+        """Every sentence and bullet the engine can emit"""
+        texts = [self.opening, *self._summary.texts, self.closing]
+        for _, bullets in self._employers:
+            texts.extend(bullets.texts)
+        return [text for text in texts if text]
+
+    def summary(self, jd_keywords):
+        """Opening, the templates matching the JD (in file order) and closing, as one paragraph"""
+        import numpy as np
+
+        hits = np.zeros(len(self._summary.texts), dtype=bool)
+        for keyword in jd_keywords:
+            ids = self._summary.index.get(keyword)
+            if ids is not None:
+                hits[ids] = True
+        chosen = np.flatnonzero(hits)[:self.max_summary].tolist()
+        return " ".join(part for part in [self.opening, *(self._summary.texts[i] for i in chosen), self.closing] if part)
+
+    def experience(self, company_name, experience_text, jd_keywords, limit=5):
+        """The best-matching bullets for an employer, most relevant first"""
+        bullets = self._employer_for(company_name.lower())
+        if bullets is None:
+            bullets = self._own_bullets(company_name.lower(), experience_text)
+        return "\n".join(f"• {bullets.texts[i]}" for i in self.rank(bullets, jd_keywords, limit))
+
+    def rank(self, bullets, jd_keywords, limit):
+        """Return up to limit bullet ids by weighted keyword overlap; core bullets fill in, in file order"""
+        import numpy as np
+
+        scores = bullets.base.copy()
+        for keyword in jd_keywords:
+            ids = bullets.index.get(keyword)
+            if ids is not None:
+                scores[ids] += self.weights.get(keyword, 1.0)
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            # Drop everything below the limit-th best score without a full sort
+            cutoff = np.partition(scores[candidates], len(candidates) - limit)[len(candidates) - limit]
+            candidates = candidates[scores[candidates] >= cutoff]
+        # Highest score first, ties in file order
+        return candidates[np.lexsort((candidates, -scores[candidates]))][:limit].tolist()
+
+    def _find_employer(self, company_lower):
+        # Whole words at the start of the name, so "Route Mobile Ltd" matches "route mobile" but "Reroute Logistics" doesn't
+        company = _slug(company_lower)
+        for match, bullets in self._employers:
+            if company == match or company.startswith(match + " "):
+                return bullets
+        return None
+
+    def _index_own_bullets(self, company_lower, experience_text):
+        lines = [line.strip() for line in experience_text.split("\n")]
+        points = [line.lstrip(_BULLET_CHARS).strip() for line in lines if line and not _is_job_header(line, company_lower)]
+        points = [point for point in points if point]
+        return _BulletSet(points, [self.keyword_matcher.extract(point) for point in points], [BASE_WEIGHT] * len(points))
+
+
+def _slug(name):
+    return " ".join(re.findall(r"[a-z0-9&+]+", name.lower()))
+
+
+def _is_job_header(line, company_lower):
+    """Whether a non-bullet line is a job's title, employer or dates line rather than a description of the work"""
+    if line[0] in _BULLET_CHARS.strip():
+        return False
+    lower = line.lower()
+    if company_lower in lower or any(pattern.search(lower) for pattern in EMPLOYER_PATTERNS):
+        return True
+    # Same test the section parser uses for a title line on its own
+    return bool(_TITLE.search(lower)) and len(lower.split()) <= 8 and not lower.endswith(".")
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_local_engine():
+    """Return the process-wide LocalEngine, loaded from LOCAL_TAXONOMY_PATH or the bundled taxonomy"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalEngine.from_file(os.getenv("LOCAL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH))
+        return _engine
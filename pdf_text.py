@@ -0,0 +1,149 @@
+"""Page-by-page PDF text extraction with page, size and time limits.
+
+``PDFPageStream`` opens the document lazily and yields one page of text at a
+time, so callers can stop reading as soon as they have what they need. The
+fastest installed backend is used: pypdfium2, then PyMuPDF (fitz), then
+PyPDF2.
+"""
+import importlib.util
+import io
+import os
+import time
+
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+PDF_MAX_TEXT_BYTES = int(os.getenv("PDF_MAX_TEXT_BYTES", str(512 * 1024)))
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", "10"))
+
+# Leading pages without any text before the file is treated as a scan
+EMPTY_PAGE_LIMIT = 3
+
+
+def _pypdfium2_pages(data):
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(data)
+
+    def pages():
+        try:
+            for index in range(len(pdf)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                yield text.replace("\r\n", "\n").replace("\r", "\n")
+        finally:
+            pdf.close()
+
+    return len(pdf), pages()
+
+
+def _fitz_pages(data):
+    import fitz
+
+    doc = fitz.open(stream=data, filetype="pdf")
+
+    def pages():
+        try:
+            for page in doc:
+                yield page.get_text()
+        finally:
+            doc.close()
+
+    return doc.page_count, pages()
+
+
+def _pypdf2_pages(data):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+    def pages():
+        # reader.pages parses each page on access, not up front
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+    return len(reader.pages), pages()
+
+
+# Backend name -> (module it needs, opener), fastest first
+BACKENDS = {
+    "pypdfium2": ("pypdfium2", _pypdfium2_pages),
+    "fitz": ("fitz", _fitz_pages),
+    "pypdf2": ("PyPDF2", _pypdf2_pages),
+}
+
+
+def available_backends():
+    """Return the names of the installed backends, fastest first"""
+    return [name for name, (module, _) in BACKENDS.items() if importlib.util.find_spec(module)]
+
+
+class PDFPageStream:
+    """Iterate over the text of a PDF one page at a time.
+
+    Iteration ends early when ``max_pages`` pages, ``max_bytes`` of text or
+    ``timeout`` seconds are reached, when the first pages have no text (a
+    scanned file), or when the caller calls ``stop``. ``truncated`` then
+    names the reason and ``pages_read`` / ``page_count`` tell how much of
+    the document was read.
+    """
+
+    def __init__(self, data, backend=None, max_pages=None, max_bytes=None, timeout=None):
+        if hasattr(data, "read"):
+            data = data.read()
+        self.data = data
+        self.backend = backend or PDF_BACKEND
+        if self.backend == "auto":
+            installed = available_backends()
+            if not installed:
+                raise RuntimeError("No PDF backend installed; install PyPDF2")
+            self.backend = installed[0]
+        elif self.backend not in BACKENDS:
+            raise ValueError(f"Unknown PDF backend {self.backend!r}; choose from {', '.join(BACKENDS)}")
+        self.max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+        self.max_bytes = PDF_MAX_TEXT_BYTES if max_bytes is None else max_bytes
+        self.timeout = PDF_TIMEOUT if timeout is None else timeout
+        self.page_count = None
+        self.pages_read = 0
+        self.text_bytes = 0
+        self.truncated = None
+
+    def stop(self, reason):
+        """Stop before the next page is read; reason is reported as ``truncated``"""
+        self.truncated = reason
+
+    def __iter__(self):
+        started = time.perf_counter()
+        self.page_count, pages = BACKENDS[self.backend][1](self.data)
+        try:
+            for text in pages:
+                self.pages_read += 1
+                encoded = text.encode("utf-8")
+                if self.text_bytes + len(encoded) > self.max_bytes:
+                    # Keep what fits of the last page
+                    encoded = encoded[:self.max_bytes - self.text_bytes]
+                    text = encoded.decode("utf-8", "ignore")
+                    self.truncated = "bytes"
+                self.text_bytes += len(encoded)
+                yield text
+
+                if self.truncated:
+                    return
+                if not self.text_bytes and self.pages_read >= EMPTY_PAGE_LIMIT:
+                    self.truncated = "no_text"
+                    return
+                if self.pages_read >= self.max_pages and self.pages_read < self.page_count:
+                    self.truncated = "pages"
+                    return
+                if time.perf_counter() - started > self.timeout and self.pages_read < self.page_count:
+                    self.truncated = "time"
+                    return
+        finally:
+            pages.close()
+
+
+def extract_text(data, **limits):
+    """Return the text of a PDF (within the limits) as one string, one line break per page"""
+    return "".join(text + "\n" for text in PDFPageStream(data, **limits))
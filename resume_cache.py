@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class ParsedResumeCache:
+    """Bounded LRU cache of parsed resumes keyed by the hash of the uploaded PDF bytes.
+
+    Entries live in memory up to ``max_entries`` / ``max_bytes`` and, when
+    ``cache_dir`` is set, are also written to disk as JSON so a parsed resume
+    survives process restarts.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024, cache_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(data, version=""):
+        """Build a cache key from raw file bytes and a parser version tag"""
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{version}-{digest}" if version else digest
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serializable value in memory and, if enabled, on disk"""
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def get_or_parse(self, data, parse_fn, version=""):
+        """Return the parsed value for data, calling parse_fn(data) on a miss.
+
+        A parse result of None is treated as a failure and is not cached.
+        """
+        key = self.key_for(data, version)
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = parse_fn(data)
+        if value is not None:
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop all in-memory entries (the disk tier is left untouched)"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, value):
+        size = len(json.dumps(value))
+        if key in self._entries:
+            self._total_bytes -= self._sizes.pop(key)
+            del self._entries[key]
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._total_bytes += size
+
+        # Evict least recently used entries until we are back under both limits
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            old_key, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(old_key)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, value):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_resume_cache():
+    """Return the process-wide ParsedResumeCache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ParsedResumeCache(
+                max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "64")),
+                max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+                cache_dir=os.getenv("RESUME_CACHE_DIR") or None,
+            )
+        return _cache
@@ -0,0 +1,240 @@
+"""Resume-to-JD match scoring.
+
+Scores are cosine similarities computed as one sparse matrix-vector product
+over all JDs (TF-IDF), optionally blended with sentence-transformer
+embeddings. Missing skills are ranked by how many JDs ask for them,
+weighted by the skill's IDF.
+
+Usage:
+    python scoring.py resume.pdf jds/ --top 20
+"""
+import argparse
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from keywords import DEFAULT_MATCHER
+
+EMBEDDING_MODEL = os.getenv("SCORER_EMBEDDING_MODEL", "")
+# Optional past JDs (directory or JSONL, as for batch.py) to fit the shared scorer on
+CORPUS_PATH = os.getenv("SCORER_CORPUS_PATH", "")
+
+
+def _text_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class MatchScorer:
+    """TF-IDF (plus optional embedding) match scorer for one resume against many JDs.
+
+    Fit once on a corpus of JDs; JD vectors are cached by text hash so
+    re-ranking the same postings only vectorizes new ones. Safe to share
+    between threads.
+    """
+
+    def __init__(self, keyword_matcher=None, embedding_model=EMBEDDING_MODEL, embedding_weight=0.5, max_cached=20000):
+        self.keyword_matcher = keyword_matcher or DEFAULT_MATCHER
+        self.embedding_model = embedding_model
+        self.embedding_weight = embedding_weight
+        self.max_cached = max_cached
+        self.vectorizer = None
+        self._encoder = None
+        self._tfidf_cache = OrderedDict()
+        self._embedding_cache = OrderedDict()
+        self._skill_cache = OrderedDict()
+        # Guards the vectorizer and the caches when one scorer serves several sessions
+        self._lock = threading.RLock()
+
+    def fit(self, corpus):
+        """Fit the TF-IDF vocabulary on an iterable of documents"""
+        vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), sublinear_tf=True)
+        vectorizer.fit(corpus)
+        with self._lock:
+            self.vectorizer = vectorizer
+            # Cached vectors belong to the previous vocabulary
+            self._tfidf_cache.clear()
+        return self
+
+    def score(self, resume_text, jd_texts):
+        """Return an array of match scores in [0, 1], one per JD"""
+        if not jd_texts:
+            return np.zeros(0)
+        with self._lock:
+            if self.vectorizer is None:
+                self.fit([resume_text] + list(jd_texts))
+
+            # Rows are L2-normalized, so cosine similarity is a single product
+            resume_vec = self.vectorizer.transform([resume_text])
+            scores = np.asarray((self._tfidf_matrix(jd_texts) @ resume_vec.T).todense()).ravel()
+
+            encoder = self._get_encoder()
+            if encoder is not None:
+                resume_emb = encoder.encode([resume_text], normalize_embeddings=True)[0]
+                emb_scores = np.clip(self._embedding_matrix(jd_texts) @ resume_emb, 0.0, 1.0)
+                scores = (1 - self.embedding_weight) * scores + self.embedding_weight * emb_scores
+
+        return scores
+
+    def rank(self, resume_text, jd_texts, top_k=None):
+        """Return (jd_index, score) pairs, best match first"""
+        scores = self.score(resume_text, jd_texts)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return [(int(i), float(scores[i])) for i in order]
+
+    def missing_skills(self, resume_text, jd_texts, top_k=10):
+        """Rank skills the JDs ask for that the resume doesn't mention.
+
+        Returns (skill, weight) pairs where weight is the fraction of JDs
+        requiring the skill times its IDF.
+        """
+        if isinstance(jd_texts, str):
+            jd_texts = [jd_texts]
+        skills = self.keyword_matcher.keywords
+        if not jd_texts or not skills:
+            return []
+
+        with self._lock:
+            required = np.vstack([self._skill_vector(text) for text in jd_texts])
+            have = self._skill_vector(resume_text)
+            idf = self._skill_idf()
+        demand = (required > 0).mean(axis=0) * (have == 0)
+        weights = demand * idf
+
+        order = np.argsort(-weights, kind="stable")[:top_k]
+        return [(skills[i], round(float(weights[i]), 3)) for i in order if weights[i] > 0]
+
+    def _tfidf_matrix(self, jd_texts):
+        keys = [_text_key(text) for text in jd_texts]
+        missing = {key: text for key, text in zip(keys, jd_texts) if key not in self._tfidf_cache}
+        fresh = {}
+        if missing:
+            # Vectorize all uncached JDs in one batch
+            matrix = self.vectorizer.transform(list(missing.values()))
+            if len(missing) == len(keys):
+                for key, row in zip(missing, matrix):
+                    self._remember(self._tfidf_cache, key, row)
+                return matrix
+            fresh = dict(zip(missing, matrix))
+            for key, row in fresh.items():
+                self._remember(self._tfidf_cache, key, row)
+        return sparse.vstack([fresh[key] if key in fresh else self._tfidf_cache[key] for key in keys], format="csr")
+
+    def _embedding_matrix(self, jd_texts):
+        keys = [_text_key(text) for text in jd_texts]
+        missing = {key: text for key, text in zip(keys, jd_texts) if key not in self._embedding_cache}
+        fresh = {}
+        if missing:
+            vectors = self._encoder.encode(list(missing.values()), normalize_embeddings=True, batch_size=64)
+            fresh = dict(zip(missing, vectors))
+            for key, vec in fresh.items():
+                self._remember(self._embedding_cache, key, vec)
+        return np.vstack([fresh[key] if key in fresh else self._embedding_cache[key] for key in keys])
+
+    def _skill_vector(self, text):
+        key = _text_key(text)
+        vec = self._skill_cache.get(key)
+        if vec is None:
+            counts = self.keyword_matcher.counts(text)
+            vec = np.array([counts.get(skill, 0) for skill in self.keyword_matcher.keywords], dtype=float)
+            self._remember(self._skill_cache, key, vec)
+        return vec
+
+    def _skill_idf(self):
+        idf = np.ones(len(self.keyword_matcher.keywords))
+        if self.vectorizer is None:
+            return idf
+        vocab = self.vectorizer.vocabulary_
+        for i, skill in enumerate(self.keyword_matcher.keywords):
+            if skill in vocab:
+                idf[i] = self.vectorizer.idf_[vocab[skill]]
+        return idf
+
+    def _get_encoder(self):
+        if not self.embedding_model:
+            return None
+        if self._encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                self.embedding_model = ""
+                return None
+            self._encoder = SentenceTransformer(self.embedding_model, device="cpu")
+        return self._encoder
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_cached:
+            cache.popitem(last=False)
+
+
+def reference_corpus(keyword_matcher=None):
+    """Documents the shared scorer is fitted on.
+
+    One document per known skill and per Smart/Local sentence, so every
+    skill is in the vocabulary, plus the JDs in SCORER_CORPUS_PATH if set.
+    """
+    from local_engine import get_local_engine
+
+    corpus = list((keyword_matcher or DEFAULT_MATCHER).keywords) + get_local_engine().texts()
+    if CORPUS_PATH:
+        from batch import iter_jds
+
+        corpus.extend(text for _, text in iter_jds(CORPUS_PATH))
+    return corpus
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_match_scorer():
+    """Return the process-wide MatchScorer, fitted once on reference_corpus()"""
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = MatchScorer().fit(reference_corpus())
+        return _scorer
+
+
+def main(argv=None):
+    from app import ResumeProcessor
+    from batch import iter_jds
+
+    parser = argparse.ArgumentParser(description="Rank job descriptions by match with a resume")
+    parser.add_argument("resume", help="Resume PDF")
+    parser.add_argument("jds", help="Directory of .txt/.md JDs, a JSONL file, or - for JSONL on stdin")
+    parser.add_argument("--top", type=int, default=20, help="Number of JDs to show")
+    args = parser.parse_args(argv)
+
+    with open(args.resume, "rb") as f:
+        parsed = ResumeProcessor().parse_resume(f.read())
+    if not parsed:
+        print(f"Could not extract text from {args.resume}", file=sys.stderr)
+        return 1
+
+    ids, texts = [], []
+    for jd_id, jd_text in iter_jds(args.jds):
+        ids.append(jd_id)
+        texts.append(jd_text)
+
+    scorer = MatchScorer().fit(texts + [parsed["text"]])
+    for index, score in scorer.rank(parsed["text"], texts, top_k=args.top):
+        print(f"{score:.3f}\t{ids[index]}")
+
+    missing = scorer.missing_skills(parsed["text"], texts)
+    if missing:
+        print("Missing skills: " + ", ".join(skill for skill, _ in missing))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
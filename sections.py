@@ -0,0 +1,213 @@
+"""Single-pass resume section parser.
+
+Lines are lowercased once and classified against a table of section
+headers; inside the experience section, employer header lines start a new
+entry. Both tables can be overridden per parser.
+"""
+import re
+
+# Section name -> header lines that open it (matched against the whole line)
+SECTION_HEADERS = {
+    "summary": ["summary", "professional summary", "career summary", "objective", "career objective",
+                "profile", "professional profile", "about me"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "technologies", "tech stack"],
+    "education": ["education", "academic background", "academics", "qualifications"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses & certifications"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+}
+
+# Words that mark the job-title half of an employer header line
+TITLE_WORDS = [
+    "engineer", "developer", "intern", "manager", "analyst", "lead", "consultant", "scientist",
+    "architect", "specialist", "administrator", "designer", "associate", "director", "programmer",
+    "officer", "head", "founder", "trainee", "sde", "swe",
+]
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = r"(?:" + _MONTH + r"\s*,?\s*)?(?:\d{1,2}\s*/\s*)?\d{4}"
+
+# Employer header patterns: a line with a date range, or a short "Title - Company" style line
+EMPLOYER_PATTERNS = [
+    re.compile(_DATE + r"\s*(?:-|–|—|to)\s*(?:present|current|now|till date|" + _DATE + r")", re.IGNORECASE),
+    re.compile(r"^[^.•●▪*]{3,80}\s(?:-|–|—|\||@|at)\s[^.]{2,80}$", re.IGNORECASE),
+]
+
+_DATE_RANGE = EMPLOYER_PATTERNS[0]
+_SEPARATORS = re.compile(r"\s+(?:-|–|—|\||@|at)\s+|\s*[|,]\s*", re.IGNORECASE)
+_BULLET = re.compile(r"^[•●▪◦*\-–]\s*")
+_HEADER_STRIP = " \t:-–—•|"
+
+# Lowercase words allowed in a job title ("Head of Engineering", "Engineer in Test")
+_TITLE_CONNECTORS = {"of", "and", "&", "for", "in", "to"}
+_TITLE_MAX_WORDS = 6
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9&+ ]+", "", text.lower()).strip()
+
+
+class ResumeSectionParser:
+    """Segment resume text into sections and employers in one pass over the lines.
+
+    Feed lines with ``feed`` (or a whole text with ``parse``) and read the
+    structured result with ``result``.
+    """
+
+    def __init__(self, headers=None, employers=None, employer_patterns=None, title_words=None):
+        headers = SECTION_HEADERS if headers is None else headers
+        self._header_lookup = {_slug(phrase): section for section, phrases in headers.items() for phrase in phrases}
+        self._employers = [(name, name.lower()) for name in (employers or [])]
+        self._employer_patterns = EMPLOYER_PATTERNS if employer_patterns is None else employer_patterns
+        title_words = TITLE_WORDS if title_words is None else title_words
+        self._title_re = re.compile(r"\b(?:" + "|".join(re.escape(w) for w in title_words) + r")s?\b")
+        self.reset()
+
+    def reset(self):
+        self._sections = {}
+        self._order = []
+        self._jobs = []
+        self._job = None
+        self._current = None
+        self._pending_title = None
+
+    def parse(self, text):
+        """Parse a whole resume text and return the result"""
+        self.reset()
+        for line in text.split("\n"):
+            self.feed(line)
+        return self.result()
+
+    def feed(self, line):
+        """Consume one line of resume text"""
+        line = line.strip()
+        if not line:
+            return
+        lower = line.lower()
+
+        section = self._header_lookup.get(_slug(lower.strip(_HEADER_STRIP)))
+        if section:
+            self._flush_pending_title()
+            self._current = section
+            if section not in self._sections:
+                self._sections[section] = []
+                self._order.append(section)
+            return
+
+        if self._current is None:
+            # Lines before the first header (name, contact details)
+            self._current = "header"
+            self._sections["header"] = []
+            self._order.append("header")
+
+        if self._current == "experience":
+            company, title = self._match_employer(line, lower)
+            if company:
+                title_line, self._pending_title = self._pending_title, None
+                self._start_job(company, title or title_line, [title_line, line] if title_line else [line])
+                return
+            self._flush_pending_title()
+            if self._title_re.search(lower) and len(lower.split()) <= 8 and not _BULLET.match(line):
+                # Possibly a title line that precedes its company line
+                self._pending_title = line
+                return
+            if self._job:
+                self._job["lines"].append(line)
+                return
+
+        self._sections[self._current].append(line)
+
+    def finished(self, sections):
+        """Whether every one of sections has been seen and the parser has moved past them"""
+        return all(name in self._sections for name in sections) and self._current not in sections
+
+    def result(self):
+        """Return the parsed resume structure.
+
+        ``summary`` is the summary paragraph, ``sections`` maps section name to
+        its text, and ``experience`` lists employers in resume order as dicts
+        with ``company``, ``title`` and ``text``.
+        """
+        self._flush_pending_title()
+        sections = {}
+        for name in self._order:
+            # Summary reads as a paragraph, everything else keeps its lines
+            joiner = " " if name == "summary" else "\n"
+            sections[name] = joiner.join(self._sections[name])
+
+        experience = [
+            {"company": job["company"], "title": job["title"], "text": "\n".join(job["lines"])}
+            for job in self._jobs
+        ]
+        if sections.get("experience"):
+            # Lines no employer line claimed (e.g. jobs whose company line wasn't recognised) are kept, not dropped
+            experience.insert(0, {"company": "Experience", "title": None, "text": sections["experience"]})
+        if experience:
+            sections["experience"] = "\n".join(job["text"] for job in experience)
+
+        return {
+            "summary": sections.get("summary", ""),
+            "sections": sections,
+            "experience": experience,
+        }
+
+    def _flush_pending_title(self):
+        if self._pending_title is None:
+            return
+        target = self._job["lines"] if self._job else self._sections[self._current]
+        target.append(self._pending_title)
+        self._pending_title = None
+
+    def _start_job(self, company, title, lines):
+        for job in self._jobs:
+            if job["company"].lower() == company.lower():
+                # A second role at the same employer continues its entry
+                job["lines"].extend(lines)
+                self._job = job
+                return
+        self._job = {"company": company, "title": title, "lines": lines}
+        self._jobs.append(self._job)
+
+    def _match_employer(self, line, lower):
+        if _BULLET.match(line):
+            return None, None
+
+        for name, name_lower in self._employers:
+            if name_lower in lower:
+                return name, None
+
+        if not any(pattern.search(lower) for pattern in self._employer_patterns):
+            return None, None
+
+        parts = [p.strip(_HEADER_STRIP) for p in _SEPARATORS.split(_DATE_RANGE.sub("", line))]
+        parts = [p for p in parts if p and not p.isdigit()]
+        if not parts:
+            return None, None
+
+        if not _DATE_RANGE.search(lower) and (line.endswith(".") or not self._is_title(parts[0])):
+            # Without dates, only a "Title - Company" line counts, not prose like "worked with the lead engineer at X"
+            return None, None
+        titles = [p for p in parts if self._title_re.search(p.lower())]
+        companies = [p for p in parts if p not in titles]
+        if companies:
+            return companies[0], titles[0] if titles else None
+        if self._jobs or self._pending_title:
+            # Only a title and dates: a new role at the previous employer
+            return None, None
+        return parts[0], None
+
+
+    def _is_title(self, text):
+        """Whether text reads as a short job title rather than part of a sentence"""
+        words = text.split()
+        if not words or len(words) > _TITLE_MAX_WORDS or not self._title_re.search(text.lower()):
+            return False
+        return all(word[0].isupper() or word[0].isdigit() or word.lower() in _TITLE_CONNECTORS or self._title_re.fullmatch(word.lower())
+                   for word in words)
+
+
+def parse_sections(text, **parser_options):
+    """Parse resume text with a fresh ResumeSectionParser"""
+    return ResumeSectionParser(**parser_options).parse(text)
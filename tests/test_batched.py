@@ -0,0 +1,73 @@
+import json
+import time
+
+from app import ResumeProcessor
+
+
+def generate(processor, timeout):
+    started = time.perf_counter()
+    results = list(processor.generate_all_results("Backend developer", {"Ipsos": "• Built APIs", "Acme": "• Ran ETL"}, ["python"],
+                                                  "Ollama", timeout=timeout, use_cache=False, batched=True))
+    return time.perf_counter() - started, {section: (content, error) for section, content, error, _ in results}
+
+
+def test_hung_batched_request_falls_back_within_one_deadline():
+    processor = ResumeProcessor()
+    processor.generate_all_batched = lambda *args: time.sleep(5) or {}
+    processor.tailor_section = lambda section, *args: (f"{section} bullets", False)
+
+    elapsed, results = generate(processor, timeout=1.0)
+
+    assert elapsed < 1.0
+    assert results == {section: (f"{section} bullets", None) for section in ["summary", "Ipsos", "Acme"]}
+
+
+def test_batched_and_fallback_share_the_deadline():
+    processor = ResumeProcessor()
+    processor.generate_all_batched = lambda *args: time.sleep(0.4) or {"summary": "batched summary"}
+    processor.tailor_section = lambda *args: time.sleep(5) or ("late", False)
+
+    elapsed, results = generate(processor, timeout=1.0)
+
+    assert elapsed < 1.5
+    assert results["summary"] == ("batched summary", None)
+    assert results["Ipsos"][0] is None and results["Ipsos"][1].kind == "timeout"
+    assert results["Acme"][0] is None and results["Acme"][1].kind == "timeout"
+
+
+def parse(content, companies=("Ipsos", "Route Mobile")):
+    return ResumeProcessor()._parse_batched(content, list(companies))
+
+
+def test_parse_batched_matches_companies_regardless_of_case():
+    content = '{"summary": "Backend developer", "experience": {"IPSOS": ["Built APIs"], "route mobile": ["Ran ETL"]}}'
+
+    assert parse(content) == {"summary": "Backend developer", "Ipsos": "• Built APIs", "Route Mobile": "• Ran ETL"}
+
+
+def test_parse_batched_accepts_string_and_list_bullets():
+    content = json.dumps({"experience": {
+        "Ipsos": "• Built APIs\n- Cut latency\n\n",
+        "Route Mobile": ["* Ran ETL", "", "  Shipped dashboards "],
+    }})
+
+    assert parse(content) == {"Ipsos": "• Built APIs\n• Cut latency", "Route Mobile": "• Ran ETL\n• Shipped dashboards"}
+
+
+def test_parse_batched_ignores_text_around_the_json():
+    content = 'Here is the JSON you asked for:\n{"summary": "Backend developer", "experience": {}}\nHope this helps!'
+
+    assert parse(content) == {"summary": "Backend developer"}
+
+
+def test_parse_batched_leaves_out_missing_and_unusable_sections():
+    content = '{"summary": "  ", "experience": {"Ipsos": [], "Acme": ["Not on the resume"], "Route Mobile": 42}}'
+
+    assert parse(content) == {}
+    assert parse('{"summary": "Backend developer", "experience": ["Ipsos"]}') == {"summary": "Backend developer"}
+
+
+def test_parse_batched_returns_nothing_for_non_json():
+    assert parse("Sorry, I can't help with that.") == {}
+    assert parse('{"summary": "cut off') == {}
+    assert parse('["summary"]') == {}
@@ -0,0 +1,39 @@
+import json
+
+from keywords import DEFAULT_ALIASES, DEFAULT_KEYWORDS, KeywordMatcher
+
+MATCHER = KeywordMatcher(DEFAULT_KEYWORDS, DEFAULT_ALIASES)
+
+
+def test_short_skills_need_word_boundaries():
+    assert MATCHER.extract("Wrote HTML emails and XML feeds") == []
+    assert MATCHER.extract("Applied ML to ranking") == ["ml"]
+    assert MATCHER.extract("Shipped ML/AI features") == ["ml", "ai"]
+
+
+def test_java_does_not_match_inside_javascript():
+    assert MATCHER.extract("JavaScript frontend") == ["javascript", "frontend"]
+    assert MATCHER.extract("Java and JavaScript") == ["javascript", "java"]
+
+
+def test_aliases_map_to_canonical_skills():
+    assert MATCHER.extract("Ran services on k8s") == ["kubernetes"]
+    assert MATCHER.extract("Designed RESTful services") == ["rest"]
+    assert MATCHER.extract("Node.js and ReactJS on Postgres") == ["postgresql", "react", "nodejs"]
+
+
+def test_longer_term_wins_over_its_prefix():
+    assert [match.term for match in MATCHER.finditer("restful rest apis api")] == ["restful", "rest", "apis", "api"]
+    assert MATCHER.counts("restful rest apis api") == {"api": 2, "rest": 2}
+
+
+def test_punctuated_skills_match_as_whole_terms():
+    assert MATCHER.extract("Owned CI/CD and back-end work") == ["ci/cd", "backend"]
+
+
+def test_from_file_reads_keywords_and_aliases(tmp_path):
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps({"keywords": ["Go", "Rust"], "aliases": {"golang": "go", "unknown": "cobol"}}))
+    matcher = KeywordMatcher.from_file(path)
+
+    assert matcher.extract("Rust, Golang and COBOL; going nowhere") == ["go", "rust"]
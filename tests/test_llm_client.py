@@ -0,0 +1,76 @@
+import socket
+import time
+
+import pytest
+
+from benchmarks.mock_llm import MockLLMServer
+from llm_client import LLMClient, LLMConnectionError, LLMRateLimitError, LLMServerError, LLMTimeoutError, raise_for_status
+from metrics import REGISTRY
+
+BODY = {"model": "llama3-8b-8192", "messages": [{"role": "user", "content": "hi"}]}
+
+
+def client(**options):
+    options.setdefault("backoff_base", 0.0)
+    return LLMClient(**options)
+
+
+def test_retries_rate_limits_and_server_errors_until_success():
+    with MockLLMServer(latency=0, status_sequence=[429, 503, 200]) as mock:
+        response = client(max_retries=3).post("groq", mock.groq_url, json=BODY)
+        assert response.status_code == 200
+        assert mock.requests == 3
+
+
+def test_gives_up_after_max_retries_with_the_last_status():
+    with MockLLMServer(latency=0, status_sequence=[503] * 5) as mock:
+        response = client(max_retries=2).post("groq", mock.groq_url, json=BODY)
+        assert mock.requests == 3
+        with pytest.raises(LLMServerError):
+            raise_for_status("groq", response)
+
+
+def test_rate_limit_surfaces_as_its_own_error_when_retries_run_out():
+    with MockLLMServer(latency=0, status_sequence=[429, 429]) as mock:
+        response = client(max_retries=1).post("groq", mock.groq_url, json=BODY)
+        with pytest.raises(LLMRateLimitError):
+            raise_for_status("groq", response)
+
+
+def test_client_errors_are_not_retried():
+    with MockLLMServer(latency=0, status_sequence=[400]) as mock:
+        assert client(max_retries=3).post("groq", mock.groq_url, json=BODY).status_code == 400
+        assert mock.requests == 1
+
+
+def test_retry_after_sets_the_delay():
+    with MockLLMServer(latency=0, status_sequence=[429, 200], retry_after="0.3") as mock:
+        started = time.perf_counter()
+        assert client(max_retries=1).post("groq", mock.groq_url, json=BODY).status_code == 200
+        assert time.perf_counter() - started >= 0.3
+
+
+def test_retry_after_is_capped():
+    with MockLLMServer(latency=0, status_sequence=[503, 200], retry_after="120") as mock:
+        started = time.perf_counter()
+        assert client(max_retries=1, retry_after_max=0.1).post("groq", mock.groq_url, json=BODY).status_code == 200
+        assert time.perf_counter() - started < 5
+
+
+def test_read_timeout_is_final():
+    with MockLLMServer(latency=1.0) as mock:
+        retries = REGISTRY.counter("llm_retries_total", backend="ollama", reason="timeout")
+        with pytest.raises(LLMTimeoutError):
+            client(max_retries=3).post("ollama", mock.ollama_url, json={"prompt": "hi"}, timeout=0.3)
+        assert mock.requests == 1
+        assert REGISTRY.counter("llm_retries_total", backend="ollama", reason="timeout") == retries
+
+
+def test_connection_errors_are_retried_then_raised():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}/api/generate"
+    retries = REGISTRY.counter("llm_retries_total", backend="ollama", reason="connection")
+    with pytest.raises(LLMConnectionError):
+        client(max_retries=2).post("ollama", url, json={"prompt": "hi"}, timeout=1)
+    assert REGISTRY.counter("llm_retries_total", backend="ollama", reason="connection") == retries + 2
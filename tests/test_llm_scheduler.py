@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pytest
+
+import llm_scheduler
+from llm_client import LLMError, LLMSaturatedError
+from llm_scheduler import LLMScheduler, current_session
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.001)
+
+
+def start(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_identical_concurrent_calls_share_one_upstream_call():
+    scheduler = LLMScheduler(concurrency={"groq": 4})
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def upstream():
+        calls.append(1)
+        release.wait(2)
+        return "reply"
+
+    threads = [start(lambda: results.append(scheduler.call("groq", "same prompt", upstream))) for _ in range(5)]
+    wait_until(lambda: calls)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == [1]
+    assert results == ["reply"] * 5
+
+
+def test_followers_get_the_leaders_error_and_the_next_call_starts_fresh():
+    scheduler = LLMScheduler(concurrency={"groq": 4})
+    flight, leader = scheduler.flight("key")
+    follower, follower_leads = scheduler.flight("key")
+    assert leader and not follower_leads and follower is flight
+
+    scheduler.finish("key", error=LLMError("boom"))
+    with pytest.raises(LLMError, match="boom"):
+        follower.result(1)
+    assert scheduler.flight("key")[1]
+
+
+def test_cancelled_leader_fails_followers_with_llm_error():
+    scheduler = LLMScheduler()
+    flight, _ = scheduler.flight("key")
+    scheduler.finish("key", error=GeneratorExit())
+    with pytest.raises(LLMError, match="cancelled"):
+        flight.result(1)
+
+
+def test_waiting_sessions_are_served_round_robin():
+    scheduler = LLMScheduler(concurrency={"groq": 1}, queue_timeout=5)
+    served = []
+    held = scheduler.slot("groq")
+    held.__enter__()
+
+    def wait_for_slot(session):
+        current_session.set(session)
+        with scheduler.slot("groq"):
+            served.append(session)
+
+    threads = []
+    # Session "a" queues three requests before "b" and "c" queue one each
+    for session in ["a", "a", "a", "b", "c"]:
+        queued = scheduler._queues["groq"].queued
+        threads.append(start(wait_for_slot, session))
+        wait_until(lambda: scheduler._queues["groq"].queued == queued + 1)
+
+    held.__exit__(None, None, None)
+    for thread in threads:
+        thread.join(2)
+
+    assert served == ["a", "b", "c", "a", "a"]
+    assert scheduler._queues["groq"].active == 0
+
+
+def test_full_queue_rejects_immediately():
+    scheduler = LLMScheduler(concurrency={"groq": 1}, max_queue=1, queue_timeout=5)
+    held = scheduler.slot("groq")
+    held.__enter__()
+    waiter = start(lambda: scheduler.slot("groq").__enter__())
+    wait_until(lambda: scheduler._queues["groq"].queued == 1)
+
+    started = time.monotonic()
+    with pytest.raises(LLMSaturatedError):
+        with scheduler.slot("groq"):
+            pass
+    assert time.monotonic() - started < 0.5
+
+    held.__exit__(None, None, None)
+    waiter.join(2)
+
+
+def test_waiting_past_the_timeout_gives_up_and_leaves_the_queue():
+    scheduler = LLMScheduler(concurrency={"groq": 1}, queue_timeout=5)
+    held = scheduler.slot("groq")
+    held.__enter__()
+
+    with pytest.raises(LLMSaturatedError):
+        with scheduler.slot("groq", timeout=0.05):
+            pass
+
+    queue = scheduler._queues["groq"]
+    assert queue.queued == 0 and not queue.waiting
+    held.__exit__(None, None, None)
+    assert queue.active == 0
+
+
+def test_slot_handed_over_as_the_wait_times_out_is_kept(monkeypatch):
+    scheduler = LLMScheduler(concurrency={"groq": 1}, queue_timeout=5)
+    held = scheduler.slot("groq")
+    held.__enter__()
+
+    class LateEvent(threading.Event):
+        def wait(self, timeout=None):
+            # The holder releases (handing its slot to this waiter) just as the wait times out
+            held.__exit__(None, None, None)
+            return False
+
+    monkeypatch.setattr(llm_scheduler.threading, "Event", LateEvent)
+    queue = scheduler._queues["groq"]
+    with scheduler.slot("groq"):
+        assert queue.active == 1
+    assert queue.active == 0 and queue.queued == 0
+
+
+def test_slots_are_per_backend():
+    scheduler = LLMScheduler(concurrency={"groq": 1, "ollama": 1}, queue_timeout=0.05)
+    with scheduler.slot("groq"):
+        with scheduler.slot("ollama"):
+            pass
+        with pytest.raises(LLMSaturatedError):
+            with scheduler.slot("groq"):
+                pass
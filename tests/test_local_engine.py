@@ -0,0 +1,32 @@
+import pytest
+
+from local_engine import DEFAULT_TAXONOMY_PATH, LocalEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return LocalEngine.from_file(DEFAULT_TAXONOMY_PATH)
+
+
+def test_taxonomy_employer_matches_on_whole_leading_words(engine):
+    for company in ["Route Mobile", "Route Mobile Ltd.", "ROUTE-MOBILE Limited"]:
+        assert "JWT tokens and OAuth" in engine.experience(company, "", ["python"])
+
+
+def test_company_containing_route_uses_its_own_bullets(engine):
+    for company in ["Reroute Logistics", "Route 66 Diner", "Mobile Route Inc"]:
+        bullets = engine.experience(company, "• Built a Django app\n• Ran Kafka", ["django"])
+        assert bullets.split("\n") == ["• Built a Django app", "• Ran Kafka"]
+
+
+def test_own_bullets_skip_title_employer_and_date_lines(engine):
+    text = "Senior Software Engineer\nAcme Corp | Jan 2020 - Present\n• Built Django REST APIs\n• Deployed services on AWS"
+    assert engine.experience("Acme Corp", text, ["aws"]).split("\n") == [
+        "• Deployed services on AWS",
+        "• Built Django REST APIs",
+    ]
+
+
+def test_optional_bullets_follow_their_keywords(engine):
+    assert "Deployed applications on AWS" not in engine.experience("Ipsos", "", ["cloud", "docker"])
+    assert engine.experience("Ipsos", "", ["aws"]).startswith("• Deployed applications on AWS")
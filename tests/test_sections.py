@@ -0,0 +1,154 @@
+from sections import ResumeSectionParser, parse_sections
+
+
+def resume(*experience_lines):
+    return "\n".join([
+        "Jane Doe",
+        "jane@example.com",
+        "Professional Summary",
+        "Backend developer building Python services.",
+        "Experience",
+        *experience_lines,
+        "Skills",
+        "Python, Django, AWS",
+    ])
+
+
+def jobs(text, **options):
+    return [(job["company"], job["title"], job["text"]) for job in parse_sections(text, **options)["experience"]]
+
+
+def test_date_range_line_starts_an_employer():
+    result = jobs(resume(
+        "Acme Corp | Jan 2020 - Present",
+        "• Built Django REST APIs",
+        "Globex, 03/2017 to 12/2019",
+        "• Wrote ETL jobs",
+    ))
+    assert result == [
+        ("Acme Corp", None, "Acme Corp | Jan 2020 - Present\n• Built Django REST APIs"),
+        ("Globex", None, "Globex, 03/2017 to 12/2019\n• Wrote ETL jobs"),
+    ]
+
+
+def test_title_dash_company_line_without_dates():
+    result = jobs(resume(
+        "Senior Software Engineer - Initech",
+        "• Migrated services to Kubernetes",
+        "Data Analyst @ Umbrella",
+        "• Built dashboards",
+    ))
+    assert result == [
+        ("Initech", "Senior Software Engineer", "Senior Software Engineer - Initech\n• Migrated services to Kubernetes"),
+        ("Umbrella", "Data Analyst", "Data Analyst @ Umbrella\n• Built dashboards"),
+    ]
+
+
+def test_title_line_before_company_line():
+    result = jobs(resume(
+        "Backend Developer",
+        "Acme Corp | Jan 2020 - Present",
+        "• Built Django REST APIs",
+    ))
+    assert result == [
+        ("Acme Corp", "Backend Developer", "Backend Developer\nAcme Corp | Jan 2020 - Present\n• Built Django REST APIs"),
+    ]
+
+
+def test_repeated_employer_continues_one_entry():
+    result = jobs(resume(
+        "Senior Engineer",
+        "Acme Corp | Jan 2022 - Present",
+        "• Led the platform team",
+        "Engineer",
+        "Acme Corp | Jan 2019 - Dec 2021",
+        "• Built Django REST APIs",
+    ))
+    assert len(result) == 1
+    company, title, text = result[0]
+    assert (company, title) == ("Acme Corp", "Senior Engineer")
+    assert text.split("\n") == [
+        "Senior Engineer", "Acme Corp | Jan 2022 - Present", "• Led the platform team",
+        "Engineer", "Acme Corp | Jan 2019 - Dec 2021", "• Built Django REST APIs",
+    ]
+
+
+def test_title_and_dates_only_is_a_new_role_at_the_previous_employer():
+    result = jobs(resume(
+        "Acme Corp | 2021 - Present",
+        "• Led the platform team",
+        "Software Engineer | 2018 - 2021",
+        "• Built Django REST APIs",
+    ))
+    assert [company for company, _, _ in result] == ["Acme Corp"]
+    assert result[0][2].endswith("Software Engineer | 2018 - 2021\n• Built Django REST APIs")
+
+
+def test_known_employer_names_match_without_a_pattern():
+    result = jobs(resume("Worked at Ipsos", "• Built pipelines"), employers=["Ipsos"])
+    assert result == [("Ipsos", None, "Worked at Ipsos\n• Built pipelines")]
+
+
+def test_sections_and_summary():
+    parsed = parse_sections(resume("Acme Corp | Jan 2020 - Present", "• Built Django REST APIs"))
+    assert parsed["summary"] == "Backend developer building Python services."
+    assert list(parsed["sections"]) == ["header", "summary", "experience", "skills"]
+    assert parsed["sections"]["skills"] == "Python, Django, AWS"
+
+
+def test_bullets_are_never_employer_lines():
+    result = jobs(resume("Acme Corp | Jan 2020 - Present", "• Migrated billing - 2019 to 2020"))
+    assert result == [("Acme Corp", None, "Acme Corp | Jan 2020 - Present\n• Migrated billing - 2019 to 2020")]
+
+
+def test_finished_once_parser_moves_past_required_sections():
+    parser = ResumeSectionParser()
+    for line in ["Summary", "Python developer.", "Experience", "Acme Corp | 2020 - Present"]:
+        parser.feed(line)
+    assert not parser.finished(("summary", "experience"))
+    parser.feed("Skills")
+    assert parser.finished(("summary", "experience"))
+
+
+def test_prose_with_a_title_word_and_at_is_not_an_employer():
+    result = jobs(resume(
+        "Acme Corp | Jan 2020 - Present",
+        "Worked closely with the lead engineer at Microsoft on integrations",
+        "Software engineer - Globex",
+    ))
+    assert [company for company, _, _ in result] == ["Acme Corp", "Globex"]
+    assert "Worked closely with the lead engineer at Microsoft on integrations" in result[0][2]
+
+
+def test_sentence_ending_in_a_period_is_not_an_employer():
+    assert jobs(resume("Mentored a junior developer - Globex.")) == [
+        ("Experience", None, "Mentored a junior developer - Globex."),
+    ]
+
+
+def test_undated_company_lines_keep_all_experience_text():
+    # Title / company layout without dates: no employer line is recognised, so nothing may be dropped
+    lines = [
+        "Software Engineer",
+        "Ipsos Research Pvt Ltd",
+        "Developed backend services using Python",
+        "Worked closely with the lead engineer at Microsoft on integrations",
+        "Software Developer",
+        "Route Mobile Limited",
+        "Implemented JWT authentication",
+    ]
+    assert jobs(resume(*lines)) == [("Experience", None, "\n".join(lines))]
+
+
+def test_lines_before_the_first_detected_job_are_kept():
+    result = jobs(resume(
+        "Intern",
+        "Initech",
+        "Wrote unit tests",
+        "Acme Corp | Jan 2020 - Present",
+        "• Built Django REST APIs",
+    ))
+    assert result == [
+        ("Experience", None, "Intern\nInitech\nWrote unit tests"),
+        ("Acme Corp", None, "Acme Corp | Jan 2020 - Present\n• Built Django REST APIs"),
+    ]